@@ -1,7 +1,9 @@
 import json
 import logging
 import os
+import threading
 from datetime import datetime
+from http.cookiejar import DefaultCookiePolicy
 from urllib.parse import quote
 
 import requests
@@ -13,17 +15,79 @@ import settings
 logger = logging.getLogger(__name__)
 
 
+class PooledRequests:
+    """Stands in for the `requests` module in pythosf, which makes every request with
+    `requests.get`, `requests.post` and so on, and so opens a new connection (and TLS
+    handshake) to the API each time. These send them through one `requests.Session`
+    instead, whose connections are kept alive and reused by every `client.Session`.
+
+    Each request carries the auth of the `client.Session` making it, so the session
+    keeps no cookies: that way sessions for different users can't pick up each other's
+    logins and it can be shared between threads.
+    """
+
+    exceptions = requests.exceptions
+
+    def __init__(self, pool_size):
+        self.http = requests.Session()
+        self.http.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self.http.headers.update(
+            {'Accept-Encoding': 'gzip, deflate', 'Connection': 'keep-alive'}
+        )
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size
+        )
+        self.http.mount('https://', adapter)
+        self.http.mount('http://', adapter)
+
+    def get(self, url, **kwargs):
+        return self.http.get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.http.post(url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.http.put(url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.http.patch(url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.http.delete(url, **kwargs)
+
+
+client.requests = PooledRequests(settings.API_POOL_SIZE)
+
+# The `client.Session` of each user, by API domain and credentials
+sessions = {}
+sessions_lock = threading.Lock()
+
+
+def get_session(user, password, api_base_url=settings.API_DOMAIN):
+    """Return the API session of `user`, creating it on first use. The same session is
+    returned for the same credentials for the rest of the run, from any thread.
+    """
+    key = (api_base_url, user, password)
+    with sessions_lock:
+        session = sessions.get(key)
+        if session is None:
+            session = sessions[key] = client.Session(
+                api_base_url=api_base_url, auth=(user, password)
+            )
+    return session
+
+
 def get_default_session():
-    return client.Session(
-        api_base_url=settings.API_DOMAIN,
-        auth=(settings.USER_ONE, settings.USER_ONE_PASSWORD),
-    )
+    return get_session(settings.USER_ONE, settings.USER_ONE_PASSWORD)
 
 
 def get_user_two_session():
-    return client.Session(
-        api_base_url=settings.API_DOMAIN,
-        auth=(settings.USER_TWO, settings.USER_TWO_PASSWORD),
+    return get_session(settings.USER_TWO, settings.USER_TWO_PASSWORD)
+
+
+def get_registrations_user_session():
+    return get_session(
+        settings.REGISTRATIONS_USER, settings.REGISTRATIONS_USER_PASSWORD
     )
 
 
@@ -1108,10 +1172,7 @@ def delete_project_contributor(session, node_id, user_name):
 def update_registration_metadata_with_custom_data(registration_id):
     """Updates registration metadata fields resource_type and
     resource_language  with custom values"""
-    session = client.Session(
-        api_base_url=settings.API_DOMAIN,
-        auth=(settings.REGISTRATIONS_USER, settings.REGISTRATIONS_USER_PASSWORD),
-    )
+    session = get_registrations_user_session()
     url = 'v2/custom_item_metadata_records/{}/'.format(registration_id)
     raw_payload = {
         'data': {
@@ -1147,10 +1208,7 @@ def get_funder_data_registration(registration_guid):
     """Returns the funder name for a project/registration
     if project/registration already has funder information data
     otherwise returns none"""
-    session = client.Session(
-        api_base_url=settings.API_DOMAIN,
-        auth=(settings.REGISTRATIONS_USER, settings.REGISTRATIONS_USER_PASSWORD),
-    )
+    session = get_registrations_user_session()
     url = 'v2/custom_item_metadata_records/{}/'.format(registration_guid)
     data = session.get(url)['data']
     if not data['attributes']['funders']:
@@ -1160,10 +1218,7 @@ def get_funder_data_registration(registration_guid):
 
 def get_registration_by_title(encoded_registration_title):
     """Return the registration node id having the title as given in encoded_registration_title"""
-    session = client.Session(
-        api_base_url=settings.API_DOMAIN,
-        auth=(settings.REGISTRATIONS_USER, settings.REGISTRATIONS_USER_PASSWORD),
-    )
+    session = get_registrations_user_session()
     registration_title = quote(encoded_registration_title)
     url = '/v2/registrations/?filter[title]=' + registration_title
     data = session.get(url)['data']
@@ -1200,10 +1255,7 @@ def update_file_metadata(session, file_guid):
 def get_registration_resource_id(registration_id):
     """This function returns the most recent resource id
     added to the given registration"""
-    session = client.Session(
-        api_base_url=settings.API_DOMAIN,
-        auth=(settings.REGISTRATIONS_USER, settings.REGISTRATIONS_USER_PASSWORD),
-    )
+    session = get_registrations_user_session()
 
     url = '/v2/registrations/{}/resources/'.format(registration_id)
     data = session.get(url)['data']
@@ -1220,10 +1272,7 @@ def get_registration_resource_id(registration_id):
 
 def delete_registration_resource(registration_id):
     """This function deletes the resource added to the given registration"""
-    session = client.Session(
-        api_base_url=settings.API_DOMAIN,
-        auth=(settings.REGISTRATIONS_USER, settings.REGISTRATIONS_USER_PASSWORD),
-    )
+    session = get_registrations_user_session()
     registration_resource_id = get_registration_resource_id(registration_id)
     url = '/v2/resources/{}'.format(registration_resource_id)
 
@@ -1234,10 +1283,7 @@ def create_registration_resource(registration_guid, resource_type):
     """This method creates new registration output resource for a given
     registration."""
 
-    session = client.Session(
-        api_base_url=settings.API_DOMAIN,
-        auth=(settings.REGISTRATIONS_USER, settings.REGISTRATIONS_USER_PASSWORD),
-    )
+    session = get_registrations_user_session()
     resource_id = get_registration_resource_id(registration_guid)
     if resource_id is not None:
         delete_registration_resource(registration_guid)
@@ -0,0 +1,114 @@
+import time
+from collections import deque
+
+from selenium.common.exceptions import WebDriverException
+
+import settings
+from base import scripts
+from base.exceptions import PageException
+
+
+class PageCheck:
+    """The outcome of loading one page: whether it `loaded` (its identity showed up),
+    how many `seconds` after its own navigation started that was seen, and the `error`
+    if it didn't.
+    """
+
+    __slots__ = ('page', 'url', 'loaded', 'seconds', 'error', 'started')
+
+    def __init__(self, page):
+        self.page = page
+        self.url = page.url
+        self.loaded = False
+        self.seconds = None
+        self.error = None
+        self.started = None
+
+    def finish(self, loaded, error=None, seconds=None):
+        self.loaded = loaded
+        self.error = error
+        if seconds is None:
+            seconds = time.monotonic() - self.started
+        self.seconds = seconds
+
+
+def check_pages(
+    driver,
+    pages,
+    tabs=settings.PAGE_CHECK_TABS,
+    timeout=settings.LONG_TIMEOUT,
+    poll_frequency=0.25,
+):
+    """Load `pages` in up to `tabs` browser tabs at once and check that each one loaded.
+
+    Every tab is pointed at its next page without waiting for it to load, then the tabs
+    are checked in turn until their page shows up or its `timeout` runs out, so the pages
+    load side by side instead of one after the other. A tab is only checked (with a
+    single `verify(wait=False)`) once its new document has replaced the previous page,
+    so that a page can't pass on what the tab showed before. The tabs opened are closed
+    afterwards and the driver is switched back to the tab it started on.
+
+    :param pages: BasePages to check, all on `driver`.
+    :param int timeout: How many seconds to give each page to load, from when its tab
+        was pointed at it.
+    :param float poll_frequency: How long to wait between rounds of checks in which no
+        page finished.
+    :return: A list of `PageCheck`s, in the order the pages were given.
+    """
+    original_window = driver.current_window_handle
+    windows = [original_window]
+    for _ in range(max(min(tabs, len(pages)), 1) - 1):
+        existing = set(driver.window_handles)
+        driver.execute_script('window.open("about:blank", "_blank");')
+        windows.extend(set(driver.window_handles) - existing)
+
+    queue = deque(pages)
+    checks = []
+    loading = {}
+
+    def start(window):
+        page = queue.popleft()
+        check = PageCheck(page)
+        checks.append(check)
+        page.clear_element_cache()
+        driver.switch_to.window(window)
+        driver.execute_script(scripts.LEAVE_FOR, check.url)
+        check.started = time.monotonic()
+        loading[window] = check
+
+    try:
+        for window in windows:
+            if queue:
+                start(window)
+        while loading:
+            finished = False
+            for window, check in list(loading.items()):
+                driver.switch_to.window(window)
+                page = check.page
+                try:
+                    elapsed = driver.execute_script(scripts.NEW_DOCUMENT)
+                    if elapsed is not None and page.verify(wait=False):
+                        check.finish(True, seconds=elapsed / 1000)
+                    elif time.monotonic() - check.started > timeout:
+                        if elapsed is None:
+                            check.finish(False, 'Page never started loading')
+                        else:
+                            page.error_handling()
+                            check.finish(False, 'Unexpected page structure')
+                    else:
+                        continue
+                except (PageException, WebDriverException) as exc:
+                    check.finish(False, repr(exc))
+                del loading[window]
+                finished = True
+                if queue:
+                    start(window)
+            if loading and not finished:
+                time.sleep(poll_frequency)
+    finally:
+        for window in windows[1:]:
+            driver.switch_to.window(window)
+            driver.close()
+        driver.switch_to.window(original_window)
+
+    return checks
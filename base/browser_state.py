@@ -0,0 +1,32 @@
+import weakref
+
+
+class BrowserState:
+    """What is known about a browser's state, so that steps that wouldn't change it can
+    be skipped.
+
+    `user` is the user last logged in with `safe_login`, '' once logged out with
+    `logout`, or None if not known (e.g. after logging in some other way). `session` is
+    the value of their session cookie at the time, to check that they're still logged
+    in. `flags` are the names of the one-off settings made in the browser (such as
+    hiding the cookie banner) since it was launched or last reset.
+    """
+
+    def __init__(self):
+        self.user = None
+        self.session = None
+        self.flags = set()
+
+
+# The state of each driver
+states = weakref.WeakKeyDictionary()
+
+
+def browser_state(driver):
+    """The `BrowserState` of `driver`."""
+    return states.setdefault(driver, BrowserState())
+
+
+def forget_state(driver):
+    """Forget everything known about `driver`'s browser, e.g. when it has been reset."""
+    states.pop(driver, None)
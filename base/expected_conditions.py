@@ -1,15 +1,47 @@
 from selenium.webdriver.support import expected_conditions as EC
 
+from base import scripts
 
-class link_has_href(object):
+
+class dom_expectation(object):
+    """Base class for Expectations that `base.waits.DomWait` can also wait on inside the
+    page. Subclasses name the in-page check (see `scripts.WAIT_FOR_CONDITION`) in
+    `condition_name` and, if it takes one, the value it expects in `expected`.
+
+    If `root` (a WebElement) is given, the element is only searched for within it.
+    """
+
+    condition_name = None
+    expected = None
+
+    def __init__(self, locator, root=None):
+        self.locator = locator
+        self.root = root
+
+    @property
+    def dom_condition(self):
+        return {
+            'name': self.condition_name,
+            'locator': self.locator,
+            'expected': self.expected,
+            'root': self.root,
+        }
+
+    def dom_result(self, result):
+        """Turn the in-page check's result into what `__call__` would have returned."""
+        return result['value'] if result['met'] else False
+
+
+class link_has_href(dom_expectation):
     """An Expectation for checking link is visible and has an href so
     you can click it."""
 
-    def __init__(self, locator):
-        self.locator = locator
+    condition_name = 'href'
 
     def __call__(self, driver):
-        element_href = EC._find_element(driver, self.locator).get_attribute('href')
+        element_href = EC._find_element(
+            self.root or driver, self.locator
+        ).get_attribute('href')
         if element_href:
             return element_href
         else:
@@ -25,3 +57,98 @@ class window_at_index(object):
 
     def __call__(self, driver):
         return len(driver.window_handles) > self.page_index
+
+
+class element_ready(dom_expectation):
+    """An Expectation for checking that an element is present, visible, clickable
+    and, optionally, has an href, using a single script call per poll.
+
+    The furthest stage reached is kept in `stage` so that a caller can tell which of
+    the checks was still failing when the wait timed out.
+    """
+
+    condition_name = 'ready'
+
+    def __init__(self, locator, require_href=False, root=None):
+        super().__init__(locator, root)
+        self.require_href = require_href
+        self.stage = None
+
+    @property
+    def expected(self):
+        return self.require_href
+
+    def dom_result(self, result):
+        self.stage = result['stage']
+        return super().dom_result(result)
+
+    def __call__(self, driver):
+        result = driver.execute_script(
+            scripts.ELEMENT_READINESS,
+            self.locator[0],
+            self.locator[1],
+            self.require_href,
+            self.root,
+        )
+        self.stage = result['stage']
+        if self.stage == 'ready':
+            return result['element']
+        return False
+
+
+class element_present(dom_expectation):
+    """An Expectation for checking that an element is on the page, visible or not."""
+
+    condition_name = 'present'
+
+    def __call__(self, driver):
+        return EC.presence_of_element_located(self.locator)(self.root or driver)
+
+
+class element_visible(dom_expectation):
+    """An Expectation for checking that an element is on the page and visible."""
+
+    condition_name = 'visible'
+
+    def __call__(self, driver):
+        return EC.visibility_of_element_located(self.locator)(self.root or driver)
+
+
+class element_gone(dom_expectation):
+    """An Expectation for checking that an element is either not on the page or not
+    visible."""
+
+    condition_name = 'gone'
+
+    def __call__(self, driver):
+        return EC.invisibility_of_element_located(self.locator)(self.root or driver)
+
+
+class text_in_element(dom_expectation):
+    """An Expectation for checking that the text of an element contains a string."""
+
+    condition_name = 'text'
+
+    def __init__(self, locator, text, root=None):
+        super().__init__(locator, root)
+        self.expected = text
+
+    def __call__(self, driver):
+        return EC.text_to_be_present_in_element(self.locator, self.expected)(
+            self.root or driver
+        )
+
+
+class number_of_elements_at_least(dom_expectation):
+    """An Expectation for checking that at least `count` elements match a locator.
+    Returns the number of matching elements."""
+
+    condition_name = 'count'
+
+    def __init__(self, locator, count, root=None):
+        super().__init__(locator, root)
+        self.expected = count
+
+    def __call__(self, driver):
+        found = len((self.root or driver).find_elements(*self.locator))
+        return found if found >= self.expected else False
@@ -0,0 +1,412 @@
+"""Records where test time goes.
+
+`locator_timings`: off unless `settings.LOCATOR_TIMINGS` is set to the path of a JSON
+file. When on, each time a locator is resolved (its WebElement found, reused, waited on
+or waited to go away) the owning page or component class, the attribute name, the
+selector, how long each wait stage took and the outcome are kept in memory. At the end
+of the test session they're written to that file, along with a ranked summary of the
+slowest and most waited-on locators, which is also printed in the pytest terminal
+summary.
+
+`navigation_timings`: off unless `settings.NAVIGATION_TIMINGS` is set to the path of a
+JSONL file. When on, every `BasePage.goto` appends a line to it with the page's
+Navigation Timing and Resource Timing entries, tagged with the test, page class and GUID.
+
+`latency_budgets`: checks the load and settle times of pages that declare a
+`load_budget_ms` or `settled_budget_ms` against those budgets and, if
+`settings.LATENCY_BASELINE` is set to the path of a JSON file, compares each page's times
+against the median times of the last few runs kept in that file.
+
+`blocked_requests`: when `settings.BLOCK_THIRD_PARTY` is on, counts the requests each
+page navigated to with `BasePage.goto` made to the blocked hosts (and the bytes they cost
+where the browser didn't block them), for the pytest terminal summary.
+"""
+
+import json
+import os
+import statistics
+import time
+import weakref
+from contextlib import contextmanager
+
+from selenium.common.exceptions import TimeoutException
+
+import settings
+from base import scripts
+
+
+class Resolution:
+    """One resolution of a locator: what was resolved, each wait stage as a
+    `(name, seconds)` pair, the total time taken and the outcome.
+    """
+
+    __slots__ = ('owner', 'name', 'selector', 'path', 'stages', 'seconds', 'outcome')
+
+    def __init__(self, owner, name, locator):
+        self.owner = owner
+        self.name = name
+        self.selector = locator.selector
+        self.path = locator.path
+        self.stages = []
+        self.seconds = 0.0
+        self.outcome = 'ok'
+
+    def as_dict(self):
+        return {attribute: getattr(self, attribute) for attribute in self.__slots__}
+
+
+class LocatorTimings:
+    """In-process collector of locator `Resolution`s.
+
+    Resolutions are only kept while `enabled`. Otherwise `resolving` and `stage` do no
+    more than yield, so that the locators can be instrumented unconditionally.
+    """
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.resolutions = []
+        self.current = None
+
+    @contextmanager
+    def resolving(self, owner, name, locator):
+        """Time the resolution of a locator in the `with` block. Stages timed inside it
+        (even from nested calls) are added to it, and the outcome is 'ok', 'timeout' if
+        a wait timed out, or the name of any other exception raised. Yields the
+        `Resolution` so the block can set a different outcome.
+        """
+        if not self.enabled or self.current is not None:
+            yield self.current
+            return
+        resolution = self.current = Resolution(owner, name, locator)
+        start = time.monotonic()
+        try:
+            yield resolution
+        except (ValueError, TimeoutException):
+            resolution.outcome = 'timeout'
+            raise
+        except Exception as exc:
+            resolution.outcome = type(exc).__name__
+            raise
+        finally:
+            resolution.seconds = time.monotonic() - start
+            self.current = None
+            self.resolutions.append(resolution)
+
+    @contextmanager
+    def stage(self, name):
+        """Time one wait stage of the resolution in progress, if there is one."""
+        resolution = self.current
+        if resolution is None:
+            yield
+            return
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            resolution.stages.append((name, time.monotonic() - start))
+
+    def summary(self):
+        """Return one row per locator (owner, attribute name and selector) with how many
+        times it was resolved, how many of those did not end 'ok', and the total, mean
+        and longest times, slowest total first.
+        """
+        rows = {}
+        for resolution in self.resolutions:
+            key = (resolution.owner, resolution.name, resolution.path)
+            row = rows.setdefault(
+                key,
+                {
+                    'owner': resolution.owner,
+                    'name': resolution.name,
+                    'selector': resolution.selector,
+                    'path': resolution.path,
+                    'count': 0,
+                    'failures': 0,
+                    'total_seconds': 0.0,
+                    'max_seconds': 0.0,
+                },
+            )
+            row['count'] += 1
+            row['failures'] += resolution.outcome != 'ok'
+            row['total_seconds'] += resolution.seconds
+            row['max_seconds'] = max(row['max_seconds'], resolution.seconds)
+        for row in rows.values():
+            row['mean_seconds'] = row['total_seconds'] / row['count']
+        return sorted(rows.values(), key=lambda row: row['total_seconds'], reverse=True)
+
+    def table(self, limit=25):
+        """Return the `limit` slowest locators from `summary` as lines of text."""
+        lines = [
+            '{:>9} {:>6} {:>8} {:>8} {:>6}  {}'.format(
+                'total (s)', 'count', 'mean (s)', 'max (s)', 'failed', 'locator'
+            )
+        ]
+        for row in self.summary()[:limit]:
+            lines.append(
+                '{total_seconds:>9.2f} {count:>6} {mean_seconds:>8.2f} '
+                '{max_seconds:>8.2f} {failures:>6}  {owner}.{name} ({path})'.format(
+                    **row
+                )
+            )
+        return lines
+
+    def write(self, path):
+        """Dump every resolution and the summary to a JSON file at `path`."""
+        with open(path, 'w') as timings_file:
+            json.dump(
+                {
+                    'resolutions': [
+                        resolution.as_dict() for resolution in self.resolutions
+                    ],
+                    'summary': self.summary(),
+                },
+                timings_file,
+                indent=2,
+            )
+
+
+def current_test():
+    """The node id of the test being run, or None outside of a test."""
+    # e.g. 'tests/test_project.py::TestProject::test_title (call)'
+    return os.environ.get('PYTEST_CURRENT_TEST', '').rsplit(' ', 1)[0] or None
+
+
+class NavigationTimings:
+    """Appends the load timings of each page navigated to with `BasePage.goto` to a
+    JSONL file at `path` (see `scripts.NAVIGATION_TIMING`), if a path is given, and
+    passes them on to `latency_budgets`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def record(self, page, settled=None):
+        """Add a line for the page `page` has just navigated to.
+
+        :param settled: True if the page was waited on and settled, in which case its
+            time to settle is taken to be now, False if it was waited on and didn't
+            settle, in which case its `unsettled` time is how long it had been busy for
+            when the wait gave up, or None if it wasn't waited on.
+        """
+        if not self.path and not latency_budgets.wanted(page):
+            return
+        timing = page.driver.execute_script(scripts.NAVIGATION_TIMING)
+        now = timing.pop('now')
+        timing['settled'] = now if settled else None
+        timing['unsettled'] = now if settled is False else None
+        entry = {
+            'timestamp': time.time(),
+            'test': current_test(),
+            'page': type(page).__name__,
+            'guid': getattr(page, 'guid', None) or None,
+        }
+        entry.update(timing)
+        latency_budgets.record(page, entry)
+        if self.path:
+            with open(self.path, 'a') as log_file:
+                log_file.write(json.dumps(entry) + '\n')
+
+
+class LatencyBudgets:
+    """Checks page load times against the budgets pages declare and a rolling baseline.
+
+    Each `BasePage` can declare a `load_budget_ms` (until the load event) and a
+    `settled_budget_ms` (until the app has settled, see `BasePage.wait_until_settled`),
+    both counted from the start of navigation. If `check_budgets`, any navigation over
+    its page's budget is a breach, as is one that never settled on a page with a
+    `settled_budget_ms`.
+
+    If `baseline_path` is given, every page's times are also collected, and at the end of
+    the run the median of each is compared against the medians of the last `runs` runs
+    kept in that file. A median more than `threshold` standard deviations above theirs
+    (and at least 5% above their mean, so that very steady times don't flag noise) is a
+    regression. Regressions are only looked for once there are at least `min_runs` runs.
+    The baseline is only compared against and added to once per process, by the first
+    test session to finish, so that the reruns of failed tests made by the invoke tasks
+    don't add their own medians.
+
+    Everything recorded is cleared with `reset` at the start of each test session.
+    """
+
+    # Each metric recorded, and the page attribute declaring its budget
+    metrics = {'load': 'load_budget_ms', 'settled': 'settled_budget_ms'}
+    min_runs = 5
+
+    def __init__(self, baseline_path, runs, threshold, check_budgets=False):
+        self.baseline_path = baseline_path
+        self.check_budgets = check_budgets
+        self.runs = runs
+        self.threshold = threshold
+        self.compared = False
+        self.reset()
+
+    def reset(self):
+        self.samples = {}
+        self.breaches = []
+        self.regressions = []
+
+    def wanted(self, page):
+        """Whether the timings of `page` need recording."""
+        return bool(self.baseline_path) or (
+            self.check_budgets
+            and any(
+                getattr(page, attribute, None) for attribute in self.metrics.values()
+            )
+        )
+
+    def record(self, page, entry):
+        """Check one navigation to `page` (a `NavigationTimings` entry) against the
+        page's budgets, and keep its times for the baseline.
+        """
+        page_class = entry['page']
+        for metric, attribute in self.metrics.items():
+            milliseconds = entry.get(metric)
+            # How long a page that never settled had been busy for
+            unsettled = entry.get('unsettled') if metric == 'settled' else None
+            if milliseconds is None and unsettled is None:
+                continue
+            if self.baseline_path and milliseconds is not None:
+                page_samples = self.samples.setdefault(page_class, {})
+                page_samples.setdefault(metric, []).append(milliseconds)
+            budget = self.check_budgets and getattr(page, attribute, None)
+            if budget and (unsettled is not None or milliseconds > budget):
+                self.breaches.append(
+                    {
+                        'test': entry['test'],
+                        'page': page_class,
+                        'url': entry['url'],
+                        'metric': metric,
+                        'milliseconds': milliseconds,
+                        'unsettled': unsettled,
+                        'budget': budget,
+                    }
+                )
+
+    def load_baseline(self):
+        try:
+            with open(self.baseline_path) as baseline_file:
+                return json.load(baseline_file)
+        except FileNotFoundError:
+            return {}
+
+    def compare(self):
+        """Compare this run's medians against the baseline, setting `regressions`, then
+        add them to the baseline and save it.
+        """
+        if not self.baseline_path or not self.samples or self.compared:
+            return
+        self.compared = True
+        baseline = self.load_baseline()
+        for page_class, page_samples in self.samples.items():
+            for metric, samples in page_samples.items():
+                median = statistics.median(samples)
+                history = baseline.setdefault(page_class, {}).setdefault(metric, [])
+                if len(history) >= self.min_runs:
+                    mean = statistics.mean(history)
+                    noise = max(statistics.stdev(history), mean * 0.05)
+                    if median - mean > self.threshold * noise:
+                        self.regressions.append(
+                            {
+                                'page': page_class,
+                                'metric': metric,
+                                'milliseconds': median,
+                                'baseline': mean,
+                                'deviations': (median - mean) / noise,
+                            }
+                        )
+                history.append(median)
+                del history[: -self.runs]
+        with open(self.baseline_path, 'w') as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+
+    def report(self):
+        """Return the breaches and regressions as lines of text."""
+        lines = [
+            (
+                '{test}: {page} {metric} took {milliseconds}ms, over its {budget}ms '
+                'budget ({url})'.format(**breach)
+                if breach['unsettled'] is None
+                else '{test}: {page} never settled (still busy after {unsettled}ms), '
+                'against its {budget}ms budget ({url})'.format(**breach)
+            )
+            for breach in self.breaches
+        ]
+        lines.extend(
+            '{page} {metric} median {milliseconds:.0f}ms vs {baseline:.0f}ms baseline '
+            '({deviations:.1f} deviations slower)'.format(**regression)
+            for regression in self.regressions
+        )
+        return lines
+
+
+class BlockedRequests:
+    """Totals, for each page class, of the requests made to the blocked `hosts` (see
+    `scripts.BLOCKED_REQUESTS`) by the pages navigated to. Nothing is counted if there
+    are no hosts.
+
+    Requests are only counted as blocked on the `drivers` that block the hosts (see
+    `utils.block_urls`). On any other driver they are counted as let through, along with
+    the bytes they transferred, which is what blocking them would save.
+    """
+
+    def __init__(self, hosts):
+        self.hosts = hosts
+        self.drivers = weakref.WeakSet()
+        self.pages = {}
+
+    def record(self, page):
+        if not self.hosts:
+            return
+        counts = page.driver.execute_script(scripts.BLOCKED_REQUESTS, self.hosts)
+        row = self.pages.setdefault(
+            type(page).__name__,
+            {
+                'blocked_loads': 0,
+                'blocked': 0,
+                'allowed_loads': 0,
+                'allowed': 0,
+                'bytes': 0,
+                'hosts': {},
+            },
+        )
+        blocked = page.driver in self.drivers
+        row['blocked_loads' if blocked else 'allowed_loads'] += 1
+        for host, count in counts.items():
+            row['blocked' if blocked else 'allowed'] += count['requests']
+            if not blocked:
+                row['bytes'] += count['bytes']
+            row['hosts'][host] = row['hosts'].get(host, 0) + count['requests']
+
+    def table(self):
+        """Return a line per page class, most requests first."""
+        rows = sorted(
+            self.pages.items(),
+            key=lambda item: item[1]['blocked'] + item[1]['allowed'],
+            reverse=True,
+        )
+        return [
+            '{blocked:>6} requests blocked over {blocked_loads:>3} loads, '
+            '{allowed:>6} ({bytes} bytes) let through over {allowed_loads:>3} loads '
+            'of {page_class} ({host_counts})'.format(
+                page_class=page_class,
+                host_counts=', '.join(
+                    '{} {}'.format(host, count) for host, count in row['hosts'].items()
+                )
+                or 'none',
+                **row
+            )
+            for page_class, row in rows
+        ]
+
+
+locator_timings = LocatorTimings(enabled=bool(settings.LOCATOR_TIMINGS))
+navigation_timings = NavigationTimings(settings.NAVIGATION_TIMINGS)
+latency_budgets = LatencyBudgets(
+    settings.LATENCY_BASELINE,
+    runs=settings.LATENCY_BASELINE_RUNS,
+    threshold=settings.LATENCY_REGRESSION_THRESHOLD,
+    check_budgets=settings.LATENCY_BUDGETS,
+)
+blocked_requests = BlockedRequests(
+    settings.THIRD_PARTY_BLOCKLIST if settings.BLOCK_THIRD_PARTY else []
+)
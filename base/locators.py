@@ -1,3 +1,5 @@
+import time
+
 from selenium.common.exceptions import (
     NoSuchElementException,
     StaleElementReferenceException,
@@ -8,6 +10,14 @@ from selenium.webdriver.support.ui import WebDriverWait
 
 import settings
 from base import expected_conditions as ec
+from base import scripts
+from base.instrumentation import locator_timings
+from base.macros import Macro
+from base.waits import (
+    DomWait,
+    condition_met,
+    negative_waits,
+)
 
 
 class WebElementWrapper:
@@ -17,59 +27,232 @@ class WebElementWrapper:
     :param driver: A selenium WebDriver.
     :param str attribute_name: The attribute name of the locator in its containing class.
     :param locator: An object of the type Locator.
+    :param str owner: The name of the containing class, for `locator_timings`.
+    :param root: The WebElementWrapper of the component the element belongs to, if it
+        should only be searched for within that component (see `ComponentLocator`).
     """
 
-    def __init__(self, driver, attribute_name, locator):
+    __slots__ = (
+        'driver',
+        'locator',
+        'name',
+        'owner',
+        'root',
+        'cached_element',
+        'cached_url',
+    )
+
+    def __init__(self, driver, attribute_name, locator, owner=None, root=None):
         self.driver = driver
         self.locator = locator
         self.name = attribute_name
+        self.owner = owner
+        self.root = root
+        self.cached_element = None
+        self.cached_url = None
 
     def __getattr__(self, item):
         """If WebElementWrapper does not have an attribute, WebElement attributes are used.
 
         `self.element` returns a WebElement, if possible, and then searches for the specified
-        attribute (`item`) within the WebElement.
+        attribute (`item`) within the WebElement. If the WebElement has gone stale it is
+        located again, once, and the attribute (or method call) is retried on the new one.
         """
-        return getattr(self.element, item)
+        try:
+            value = getattr(self.element, item)
+        except StaleElementReferenceException:
+            value = getattr(self.refresh(), item)
+        if not callable(value):
+            return value
+
+        def retry_if_stale(*args, **kwargs):
+            try:
+                return value(*args, **kwargs)
+            except StaleElementReferenceException:
+                return getattr(self.refresh(), item)(*args, **kwargs)
+
+        return retry_if_stale
 
     @property
     def element(self):
-        """Return the WebElement directly."""
-        return self.locator.get_web_element(self.driver, self.name)
+        """Return the WebElement directly.
 
-    def present(self):
+        The WebElement found last time is reused as long as it is still attached to the
+        same page and still visible and clickable (checked with one script call).
+        Otherwise, it is located again with `Locator.get_web_element`.
+        """
+        with locator_timings.resolving(self.owner, self.name, self.locator):
+            element = self.reusable_cached_element()
+            if element is not None:
+                return element
+            return self.refresh()
+
+    def reusable_cached_element(self):
+        """Return the WebElement found last time if it is still attached to the same
+        page and still visible and clickable (checked with one script call), otherwise
+        None.
+        """
+        if self.cached_element is None:
+            return None
+        with locator_timings.stage('cached'):
+            try:
+                url = self.driver.execute_script(
+                    scripts.CACHED_ELEMENT_READINESS,
+                    self.cached_element,
+                    self.cached_url,
+                    'href' in self.name,
+                )
+            except StaleElementReferenceException:
+                url = None
+        if not url:
+            return None
+        self.cached_url = url
+        return self.cached_element
+
+    def refresh(self):
+        """Forget any cached WebElement and locate it again."""
+        self.clear_cache()
+        with locator_timings.resolving(self.owner, self.name, self.locator):
+            element = within(
+                self.root,
+                lambda root: self.locator.get_web_element(self.driver, self.name, root),
+            )
+        if settings.CACHE_ELEMENTS:
+            self.cached_element = element
+        return element
+
+    def clear_cache(self):
+        self.cached_element = None
+        self.cached_url = None
+
+    def scope(self, find, wait=True):
+        """Call `find` with this element's WebElement, for the elements of a component
+        to be searched for within it. The WebElement is located the first time, with
+        one wait (or, if `wait` is False, only if it is there straight away, otherwise
+        `ValueError` is raised), and then reused for as long as `element` would reuse it.
+        If it goes stale during `find`, it is located again and `find` is retried once.
+        """
+        root = self.scope_element(wait)
+        try:
+            return find(root)
+        except StaleElementReferenceException:
+            pass
+        except ValueError:
+            # Without COMPOSITE_WAITS, WebDriverWait reports a stale root as the child
+            # not being found, so only retry if it was the root that went stale.
+            if not is_stale(root):
+                raise
+        self.clear_cache()
+        return find(self.scope_element(wait))
+
+    def scope_element(self, wait):
+        if wait:
+            return self.element
+        with locator_timings.resolving(self.owner, self.name, self.locator):
+            element = self.reusable_cached_element()
+        if element is not None:
+            return element
+        element = self.locator.get_ready_web_element(self.driver, self.name, timeout=0)
+        if settings.CACHE_ELEMENTS:
+            self.cached_element = element
+        return element
+
+    def present(self, wait=True):
         """Wait for an element to be visible on page.
 
+        :param bool wait: If False, check just once instead of waiting for the locator's
+            timeout.
         :return: True if element appears. False if timeout.
         """
         try:
-            self.element
+            if wait:
+                self.element
+            else:
+                with locator_timings.resolving(self.owner, self.name, self.locator):
+                    element = within(
+                        self.root,
+                        lambda root: self.locator.get_ready_web_element(
+                            self.driver, self.name, timeout=0, root=root
+                        ),
+                        wait=False,
+                    )
+                if settings.CACHE_ELEMENTS:
+                    self.cached_element = element
             return True
         except ValueError:
             return False
 
-    def absent(self):
+    def absent(self, timeout=None):
         """Wait for an element to not be visible on page.
 
+        If the element is already gone on the first check this returns straight away.
+        The time spent is added to `waits.negative_waits`.
+
+        :param int timeout: Seconds to wait instead of the locator's timeout.
         :return: True if element disappears. False if timeout.
         """
-        try:
-            WebDriverWait(self.driver, self.locator.timeout).until(
-                EC.invisibility_of_element_located(self.locator.location)
+        if timeout is None:
+            timeout = self.locator.timeout
+        start = time.monotonic()
+
+        def gone_within(seconds):
+            return within(
+                self.root,
+                lambda root: condition_met(
+                    self.driver, ec.element_gone(self.locator.location, root), seconds
+                ),
+                wait=False,
             )
-            return True
-        except TimeoutException:
-            return False
 
-    def here_then_gone(self):
+        with locator_timings.resolving(
+            self.owner, self.name, self.locator
+        ) as resolution:
+            try:
+                with locator_timings.stage('gone_check'):
+                    already_gone = gone = gone_within(0)
+                if not already_gone:
+                    with locator_timings.stage('gone'):
+                        gone = gone_within(timeout)
+            except ValueError:
+                # The component it belongs to isn't visible, so neither is the element
+                already_gone = gone = True
+            if resolution is not None and not gone:
+                resolution.outcome = 'still visible'
+        negative_waits.record(time.monotonic() - start, already_gone, gone)
+        return gone
+
+    def not_present(self):
+        """Negative assertion that an element is not visible on page, for elements
+        that should not be there at all rather than ones expected to go away. Only waits
+        `settings.NEGATIVE_TIMEOUT` seconds for the element to disappear.
+
+        :return: True if element is not visible. False if it still is after the timeout.
+        """
+        return self.absent(settings.NEGATIVE_TIMEOUT)
+
+    def here_then_gone(self, appearance_timeout=settings.APPEARANCE_TIMEOUT):
         """In theory, wait for an element to appear and then disappear.
         Often used to wait for loading indicators to disappear before
         continuing testing. Appearance is not mandatory as sometimes an
-        element may disappear faster than selenium can check for its presence.
+        element may disappear faster than selenium can check for its presence,
+        so the element is only given `appearance_timeout` seconds to show up.
 
         :return: True if element disappears. False if timeout on waiting for disappearance.
         """
-        self.present()
+        start = time.monotonic()
+        try:
+            within(
+                self.root,
+                lambda root: condition_met(
+                    self.driver,
+                    ec.element_visible(self.locator.location, root),
+                    appearance_timeout,
+                ),
+                wait=False,
+            )
+        except ValueError:
+            pass
+        negative_waits.appearance_seconds += time.monotonic() - start
         if not self.absent():
             raise ValueError('Element {} is not absent.'.format(self.name))
         return True
@@ -104,12 +287,174 @@ class WebElementWrapper:
         self.driver.maximize_window()
 
     def send_keys(self, keys):
-        self.element.send_keys(keys)
+        try:
+            self.element.send_keys(keys)
+        except StaleElementReferenceException:
+            self.refresh().send_keys(keys)
+
+    def send_keys_deliberately(
+        self, keys, chunk_size=settings.TYPING_CHUNK_SIZE, by_script=False
+    ):
+        """Type keys into an input and make sure all of them made it.
+
+        Keys are sent `chunk_size` at a time or, if `by_script`, the value is set with a
+        script that fires the `input` and `change` events Ember listens for. For a
+        textarea or plain text input, the value is then read back once and, if keys went
+        missing, set with the script instead. Other inputs aren't checked.
+        """
+        try:
+            self.type_into(self.element, keys, chunk_size, by_script)
+        except StaleElementReferenceException:
+            self.type_into(self.refresh(), keys, chunk_size, by_script)
+
+    def type_into(self, element, keys, chunk_size, by_script):
+        initial = self.driver.execute_script(scripts.TEXT_INPUT_VALUE, element)
+        # Special keys (e.g. Keys.ENTER) don't end up in the value, so it can't be checked
+        if initial is None or any('\ue000' <= key <= '\uf8ff' for key in keys):
+            expected = None
+        else:
+            expected = initial + keys
+
+        if by_script and expected is not None:
+            self.driver.execute_script(scripts.SET_INPUT_VALUE, element, expected)
+            return
+        for start in range(0, len(keys), chunk_size):
+            element.send_keys(keys[start : start + chunk_size])
+        if expected is not None and element.get_property('value') != expected:
+            # Set it in one go rather than typing it all again, as an input that
+            # reformats its value would never match anyway
+            self.driver.execute_script(scripts.SET_INPUT_VALUE, element, expected)
+
+
+class GroupElementWrapper:
+    """A wrapper for the list of WebElements found by a GroupLocator. Behaves like the list
+    (supports `len`, indexing and iteration, which finds the elements the first time it's
+    needed) but adds methods that read the text and attributes of every element with a
+    single script call instead of one WebDriver command per element.
+
+    :param driver: A selenium WebDriver.
+    :param str attribute_name: The attribute name of the locator in its containing class.
+    :param locator: An object of the type GroupLocator.
+    :param str owner: The name of the containing class, for `locator_timings`.
+    :param root: The WebElementWrapper of the component the elements belong to, if
+        they should only be searched for within that component.
+    """
+
+    __slots__ = ('driver', 'locator', 'name', 'owner', 'root', 'found_elements')
+
+    def __init__(self, driver, attribute_name, locator, owner=None, root=None):
+        self.driver = driver
+        self.locator = locator
+        self.name = attribute_name
+        self.owner = owner
+        self.root = root
+        self.found_elements = None
+
+    @property
+    def elements(self):
+        """Return the list of WebElements directly."""
+        if self.found_elements is None:
+            with locator_timings.resolving(self.owner, self.name, self.locator):
+                with locator_timings.stage('find'):
+                    self.found_elements = within(
+                        self.root,
+                        lambda root: self.locator.get_web_elements(self.driver, root),
+                    )
+        return self.found_elements
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __getitem__(self, index):
+        return self.elements[index]
+
+    def __iter__(self):
+        return iter(self.elements)
+
+    def __eq__(self, other):
+        return self.elements == other
+
+    def __repr__(self):
+        return repr(self.elements)
+
+    def extract(self, attributes=(), rects=False, descendant=None):
+        """Return a dictionary for every element found with its WebElement (`element`),
+        its visible text (`text`), the values of the requested attributes (`attributes`)
+        and, if requested, its position and size (`rect`). All of it comes from one script.
+
+        :param attributes: Names of the attributes to read from each element.
+        :param bool rects: Whether to include each element's bounding rect.
+        :param str descendant: CSS selector of a descendant of each element to read the
+        text and attributes from instead of the element itself. `text` is None if the
+        element has no such descendant.
+        """
+        with locator_timings.resolving(self.owner, self.name, self.locator):
+            with locator_timings.stage('extract'):
+                items = within(
+                    self.root,
+                    lambda root: self.driver.execute_script(
+                        scripts.EXTRACT_ELEMENTS,
+                        self.locator.selector,
+                        self.locator.path,
+                        list(attributes),
+                        rects,
+                        descendant,
+                        root,
+                    ),
+                )
+        self.found_elements = [item['element'] for item in items]
+        return items
+
+    def texts(self, descendant=None):
+        """Return the visible text of every element."""
+        return [item['text'] for item in self.extract(descendant=descendant)]
+
+    def attributes(self, attribute_name, descendant=None):
+        """Return the value of an attribute for every element."""
+        return [
+            item['attributes'].get(attribute_name)
+            for item in self.extract([attribute_name], descendant=descendant)
+        ]
+
+    def find_by_text(self, text, exact=True, descendant=None):
+        """Return the first element whose visible text is `text` (or contains it if
+        `exact` is False), or None if there is no such element.
+        """
+        for item in self.extract(descendant=descendant):
+            if item['text'] is None:
+                continue
+            matched = item['text'] == text if exact else text in item['text']
+            if matched:
+                return item['element']
+        return None
+
+    def find_by_attribute(self, attribute_name, value, descendant=None):
+        """Return the first element whose attribute `attribute_name` equals `value`, or
+        None if there is no such element.
+        """
+        for item in self.extract([attribute_name], descendant=descendant):
+            if item['attributes'].get(attribute_name) == value:
+                return item['element']
+        return None
+
 
-    def send_keys_deliberately(self, keys):
-        """Send keys one at a time to ensure accuracy"""
-        for k in keys:
-            self.element.send_keys(k)
+def is_stale(element):
+    """Return whether the WebElement has been removed from the page."""
+    try:
+        element.is_enabled()
+    except StaleElementReferenceException:
+        return True
+    return False
+
+
+def within(root, find, wait=True):
+    """Call `find` with the WebElement to search within: that of `root`, the
+    WebElementWrapper of a scoped component (see `WebElementWrapper.scope`), or None to
+    search the whole page if there's no root.
+    """
+    if root is None:
+        return find(None)
+    return root.scope(find, wait)
 
 
 class BaseLocator:
@@ -120,15 +465,24 @@ class BaseLocator:
     when searching for the element.
     """
 
+    __slots__ = ('selector', 'path', 'location', 'timeout')
+
+    # Whether the object returned by `get_element` can be kept and reused by the
+    # BaseElement it belongs to
+    reusable = False
+
     def __init__(self, selector, path, timeout=settings.TIMEOUT):
         self.selector = selector
         self.path = path
         self.location = (selector, path)
         self.timeout = timeout
 
-    def get_element(self, driver, attribute_name):
+    def get_element(self, driver, attribute_name, owner=None, root=None):
         """Must be implemented by every Locator subclass. Defines how a locator is used within
         a page (or element). Ultimately is a locator's return value when used in the PageObject model.
+
+        `owner` is the name of the containing class, used when recording `locator_timings`,
+        and `root` the WebElementWrapper of the component to search within, if any.
         """
         raise NotImplementedError
 
@@ -140,10 +494,22 @@ class Locator(BaseLocator):
     :param str path: String that uniquely identifies the element, dependant on selector.
     :param int timeout: How many seconds to wait when using a `WebDriverWait` in Locator methods
     most notably `get_web_element`. You may end up waiting longer than your timeout because some
-    methods use more than one Wait.
+    methods use more than one Wait (unless `settings.COMPOSITE_WAITS` is on).
     """
 
-    def get_web_element(self, driver, attribute_name):
+    __slots__ = ()
+
+    reusable = True
+
+    # Failure message for each stage an element can get stuck at before it is ready
+    readiness_errors = {
+        'absent': 'Element {} not present on page. {}',
+        'present': 'Element {} not visible before timeout. {}',
+        'visible': 'Element {} not clickable before timeout. {}',
+        'clickable': 'Element {} on page but does not have a href. {}',
+    }
+
+    def get_web_element(self, driver, attribute_name, root=None):
         """
         Check if element is on page and visible before returning the selenium
         WebElement. If element is not found or visible raises `ValueError`.
@@ -152,12 +518,19 @@ class Locator(BaseLocator):
 
         :param driver: A selenium WebDriver.
         :param str attribute_name: The attribute name of the locator in its containing class.
+        :param root: A WebElement to search within instead of the whole page.
         :return: The WebElement represented by the locator.
         """
+        if settings.COMPOSITE_WAITS:
+            return self.get_ready_web_element(driver, attribute_name, root=root)
+
+        context = root or driver
+
         try:
-            WebDriverWait(driver, self.timeout).until(
-                EC.presence_of_element_located(self.location)
-            )
+            with locator_timings.stage('present'):
+                WebDriverWait(context, self.timeout).until(
+                    EC.presence_of_element_located(self.location)
+                )
         except (TimeoutException, StaleElementReferenceException):
             raise ValueError(
                 'Element {} not present on page. {}'.format(
@@ -166,9 +539,10 @@ class Locator(BaseLocator):
             ) from None
 
         try:
-            WebDriverWait(driver, self.timeout).until(
-                EC.visibility_of_element_located(self.location)
-            )
+            with locator_timings.stage('visible'):
+                WebDriverWait(context, self.timeout).until(
+                    EC.visibility_of_element_located(self.location)
+                )
         except (TimeoutException, StaleElementReferenceException):
             raise ValueError(
                 'Element {} not visible before timeout. {}'.format(
@@ -177,9 +551,10 @@ class Locator(BaseLocator):
             ) from None
 
         try:
-            WebDriverWait(driver, self.timeout).until(
-                EC.element_to_be_clickable(self.location)
-            )
+            with locator_timings.stage('clickable'):
+                WebDriverWait(context, self.timeout).until(
+                    EC.element_to_be_clickable(self.location)
+                )
         except (TimeoutException, StaleElementReferenceException):
             raise ValueError(
                 'Element {} not clickable before timeout. {}'.format(
@@ -189,9 +564,10 @@ class Locator(BaseLocator):
 
         if 'href' in attribute_name:
             try:
-                WebDriverWait(driver, self.timeout).until(
-                    ec.link_has_href(self.location)
-                )
+                with locator_timings.stage('href'):
+                    WebDriverWait(context, self.timeout).until(
+                        ec.link_has_href(self.location)
+                    )
             except (TimeoutException, StaleElementReferenceException):
                 raise ValueError(
                     'Element {} on page but does not have a href. {}'.format(
@@ -199,7 +575,7 @@ class Locator(BaseLocator):
                     )
                 ) from None
         try:
-            return driver.find_element(self.selector, self.path)
+            return context.find_element(self.selector, self.path)
         except NoSuchElementException:
             raise ValueError(
                 'Element {} was present, but now is gone. {}'.format(
@@ -207,8 +583,33 @@ class Locator(BaseLocator):
                 )
             ) from None
 
-    def get_element(self, driver, attribute_name):
-        return WebElementWrapper(driver, attribute_name, self)
+    def get_ready_web_element(self, driver, attribute_name, timeout=None, root=None):
+        """Same checks as `get_web_element` but all of them (presence, visibility,
+        clickability and, for `href` attributes, having an href) are made by one
+        injected script, and the script hands back the element itself. With
+        `settings.EVENT_WAITS` the script waits in the page for the DOM to change
+        instead of being polled (see `base.waits.DomWait`). Raises the same `ValueError`
+        as `get_web_element`, naming the check that had not passed when the wait timed
+        out.
+
+        :param timeout: Seconds to wait instead of the locator's own timeout.
+        :param root: A WebElement to search within instead of the whole page.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        condition = ec.element_ready(self.location, 'href' in attribute_name, root)
+        try:
+            with locator_timings.stage('ready'):
+                return DomWait(driver, timeout).until(condition)
+        except TimeoutException:
+            raise ValueError(
+                self.readiness_errors[condition.stage or 'absent'].format(
+                    attribute_name, driver.current_url
+                )
+            ) from None
+
+    def get_element(self, driver, attribute_name, owner=None, root=None):
+        return WebElementWrapper(driver, attribute_name, self, owner, root)
 
 
 class GroupLocator(BaseLocator):
@@ -219,45 +620,104 @@ class GroupLocator(BaseLocator):
     you are attempting to locate.
     """
 
-    def get_web_elements(self, driver):
-        return driver.find_elements(self.selector, self.path)
+    __slots__ = ()
 
-    def get_element(self, driver, attribute_name=None):
-        """Return a list of WebElements. Return empty list if none fitting locator criteria are found."""
-        return self.get_web_elements(driver)
+    def get_web_elements(self, driver, root=None):
+        return (root or driver).find_elements(self.selector, self.path)
+
+    def get_element(self, driver, attribute_name=None, owner=None, root=None):
+        """Return a GroupElementWrapper around the list of WebElements. The list is empty
+        if none fitting locator criteria are found.
+        """
+        return GroupElementWrapper(driver, attribute_name, self, owner, root)
 
 
 class ComponentLocator(Locator):
-    """How to locate a Component within a PageObject. Currently, component locators
-    are just for namespacing large/discrete sections of PageObjects. In the future,
-    theoretically may specifically locate a component WebElement and search for elements
-    within that component.
+    """How to locate a Component within a PageObject.
 
-    TODO: Actually use these like a locator, or rename and restructure
+    Without a selector and path, component locators are just for namespacing
+    large/discrete sections of PageObjects and the component's locators search the whole
+    page. With them, they locate the component's root element (once, waiting up to
+    `timeout` for it) and the component's locators only search within that element.
 
     :param component_class: A subclass of BaseElment.
-    Note: Currently the parameters selector, path, and timeout don't do anything.
+    :param selector: An instance of selenium By, to locate the component's root element.
+    :param str path: String that uniquely identifies the component's root element.
+    :param int timeout: How many seconds to wait for the root element.
     """
 
+    __slots__ = ('component_class',)
+
     def __init__(
         self, component_class, selector=None, path=None, timeout=settings.TIMEOUT
     ):
         super().__init__(selector, path, timeout)
         self.component_class = component_class
 
-    def get_element(self, driver, attribute_name=None):
-        return self.component_class(driver)
+    def get_element(self, driver, attribute_name=None, owner=None, root=None):
+        component = self.component_class(driver)
+        if self.path is not None:
+            root = WebElementWrapper(driver, attribute_name, self, owner, root)
+        component.root = root
+        return component
 
 
-class BaseElement:
-    """Abstract base class from which all Element and eventually Page classes inherit.
-    Handles waffled pages, storage of the WebDriver, and returning WebElements when Locators are
-    accessed.
+class LocatorAttribute:
+    """Stands in for a Locator in the class body of a BaseElement subclass (swapped in by
+    `BaseElementMeta` when the class is defined), so that accessing the attribute on an
+    instance uses the Locator to grab the element it represents from the WebDriver, while
+    every other attribute is looked up the normal way.
+
+    Accessing the attribute on the class itself returns the Locator.
     """
 
-    default_timeout = settings.TIMEOUT
+    __slots__ = ('name', 'locator')
 
-    def __new__(cls, *args, **kwargs):
+    def __init__(self, name, locator):
+        self.name = name
+        self.locator = locator
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self.locator
+        owner = type(instance).__name__
+        if not self.locator.reusable:
+            return self.locator.get_element(
+                instance.driver, self.name, owner, instance.root
+            )
+        # Keep the WebElementWrapper (or component) for the life of the instance so
+        # that the WebElement it finds is reused the next time the attribute is used.
+        located = instance.located
+        if self.name not in located:
+            located[self.name] = self.locator.get_element(
+                instance.driver, self.name, owner, instance.root
+            )
+        return located[self.name]
+
+
+class BaseElementMeta(type):
+    """Metaclass of BaseElement. Does the per-class work once instead of on every
+    attribute access or instantiation: it swaps each Locator in a class body for a
+    `LocatorAttribute`, records every Locator of the class (including inherited ones)
+    in `locators`, and remembers which waffled class to use for each set of waffle flags.
+    """
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        for attribute_name, value in namespace.items():
+            if isinstance(value, BaseLocator):
+                setattr(cls, attribute_name, LocatorAttribute(attribute_name, value))
+
+        cls.locators = {}
+        for klass in reversed(cls.__mro__):
+            for attribute_name, value in vars(klass).items():
+                if isinstance(value, LocatorAttribute):
+                    cls.locators[attribute_name] = value.locator
+                else:
+                    cls.locators.pop(attribute_name, None)
+        cls.waffled_class_for_flags = (None, cls)
+
+    def __call__(cls, *args, **kwargs):
         """Check if an element or page has a waffle version. If waffle is on,
         use the class for the newer waffled version (will have different locators)
         instead of the class initially requested.
@@ -265,28 +725,52 @@ class BaseElement:
         Requires a `waffle_override` dictionary in the BaseElement subclass in the format
         `waffle_override = {<waffle flag>: <BaseElement subclass to use if waffle is on>}`
 
+        The class to use is worked out once per set of waffle flags (`settings.EMBER_PAGES`),
+        and is itself called, so that its own `waffle_override` applies too.
+
         :return: Instance of the class in the waffle_override dictionary if waffle flag is true,
-        otherwise, instance of the original class on which _new_ was called.
+        otherwise, instance of the original class that was called.
         """
-        page = super().__new__(cls)
+        target = cls
         if hasattr(cls, 'waffle_override'):
-            for waffle_name in cls.waffle_override:
-                if waffle_name in settings.EMBER_PAGES:
-                    page = super().__new__(cls.waffle_override[waffle_name])
-        page.__init__(*args, **kwargs)
-        return page
+            flags = tuple(settings.EMBER_PAGES)
+            resolved_flags, target = cls.waffled_class_for_flags
+            if resolved_flags != flags:
+                target = cls
+                for waffle_name in cls.waffle_override:
+                    if waffle_name in flags:
+                        target = cls.waffle_override[waffle_name]
+                cls.waffled_class_for_flags = (flags, target)
+        if target is not cls:
+            return target(*args, **kwargs)
+        return super().__call__(*args, **kwargs)
+
+
+class BaseElement(metaclass=BaseElementMeta):
+    """Abstract base class from which all Element and eventually Page classes inherit.
+    Handles waffled pages, storage of the WebDriver, and returning WebElements when Locators are
+    accessed.
+    """
+
+    default_timeout = settings.TIMEOUT
+
+    # The WebElementWrapper of the element this component is searched for within, set
+    # when it's located by a ComponentLocator with a selector and path
+    root = None
 
     def __init__(self, driver):
         self.driver = driver
+        self.located = {}
 
     def verify(self):
         raise NotImplementedError
 
-    def __getattribute__(self, attribute_name):
-        """Return the normal expected value from __getattribute__ unless the attribute is a Locator.
-        In that case, use the Locator to grab the element it represents from the WebDriver.
+    def clear_element_cache(self):
+        """Forget the WebElements found so far, e.g. after navigating to another page."""
+        self.located.clear()
+
+    def macro(self):
+        """Start a `Macro`: a sequence of steps against this element's locators that's
+        run in the browser with one script call.
         """
-        value = object.__getattribute__(self, attribute_name)
-        if isinstance(value, BaseLocator):
-            return value.get_element(self.driver, attribute_name)
-        return value
+        return Macro(self)
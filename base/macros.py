@@ -0,0 +1,120 @@
+import settings
+from base import scripts
+from base.waits import set_script_timeout
+
+
+class Macro:
+    """A short sequence of dependent steps (clicks, waits, typing, picking an option)
+    against the locators of a page or component, run in the browser by a single
+    `execute_async_script` (`scripts.RUN_MACRO`) instead of a few WebDriver commands per
+    step. Get one with `BaseElement.macro()`, add steps with the chainable methods below
+    and call `run`:
+
+        page.macro().click('listbox_trigger').select('listbox_options', 'QA').run()
+
+    Each step waits up to its locator's timeout for its element. A step that fails
+    raises a `ValueError` naming the step. Steps are for interactions within a page,
+    so don't add any after one that navigates to another page.
+
+    Clicks are made by dispatching `mousedown`, `mouseup` and `click` events to the
+    element, not through WebDriver. So unlike `WebElement.click`, nothing checks that
+    the element would actually receive a user's click (e.g. that no overlay or loading
+    indicator covers it). Only click elements that are ready once they are clickable,
+    and wait out anything that could cover them first (see `here_then_gone`).
+
+    :param element: The BaseElement (page or component) whose locators the steps use.
+    """
+
+    # Why a step failed, for each stage its element had got to (see `scripts.RUN_MACRO`)
+    failures = {
+        'absent': 'not present on page',
+        'present': 'not visible before timeout',
+        'visible': 'not clickable before timeout',
+        'still visible': 'still visible at timeout',
+        'error': 'raised {error}',
+    }
+
+    def __init__(self, element):
+        self.element = element
+        self.steps = []
+
+    def add_step(self, action, check, locator, text=None):
+        """Add a step. `locator` is the name of one of the element's locators, or a
+        Locator.
+        """
+        if isinstance(locator, str):
+            name, locator = locator, self.element.locators[locator]
+        else:
+            name = locator.path
+        self.steps.append(
+            {
+                'action': action,
+                'check': check,
+                'name': name,
+                'by': locator.selector,
+                'path': locator.path,
+                'text': text,
+                'timeout': int(locator.timeout * 1000),
+            }
+        )
+        return self
+
+    def click(self, locator):
+        """Wait for an element to be clickable and click it."""
+        return self.add_step('click', 'ready', locator)
+
+    def select(self, locator, text):
+        """Wait for the element of a group (e.g. the options of a listbox) whose visible
+        text is `text` and click it.
+        """
+        return self.add_step('click', 'option', locator, text)
+
+    def type(self, locator, text):
+        """Wait for an input and set its value to `text`, firing the `input` and
+        `change` events typing would.
+        """
+        return self.add_step('type', 'ready', locator, text)
+
+    def here_then_gone(self, locator):
+        """Wait up to `settings.APPEARANCE_TIMEOUT` seconds for an element (e.g. a
+        loading indicator) to show up and, if it does, for it to go away again, like
+        `WebElementWrapper.here_then_gone`.
+        """
+        self.add_step('wait', 'here_then_gone', locator)
+        step = self.steps[-1]
+        step['appear'] = settings.APPEARANCE_TIMEOUT * 1000
+        step['timeout'] += step['appear']
+        return self
+
+    def wait_for(self, locator, gone=False):
+        """Wait for an element to be clickable or, if `gone`, to not be visible."""
+        return self.add_step('wait', 'gone' if gone else 'ready', locator)
+
+    def run(self):
+        """Run every step in one script call.
+
+        :raises ValueError: If a step's element did not get to where the step needed it
+            to before its timeout.
+        """
+        driver = self.element.driver
+        set_script_timeout(driver, sum(step['timeout'] for step in self.steps) / 1000)
+
+        def run_steps(root):
+            return driver.execute_async_script(scripts.RUN_MACRO, self.steps, root)
+
+        if self.element.root is None:
+            result = run_steps(None)
+        else:
+            result = self.element.root.scope(run_steps)
+
+        if not result['ok']:
+            step = self.steps[result['step']]
+            raise ValueError(
+                'Step {} ({} {}) failed: element {}. {}'.format(
+                    result['step'] + 1,
+                    step['action'],
+                    step['name'],
+                    self.failures[result['stage']].format(error=result.get('error')),
+                    driver.current_url,
+                )
+            )
@@ -0,0 +1,933 @@
+"""JavaScript snippets injected into the browser by the page object framework.
+
+Every WebDriver command is a round trip to the browser (an internet round trip when
+running on BrowserStack), so checks that would otherwise take several commands are
+written here as a single script and sent with `execute_script`.
+"""
+
+# Defines `osfFind(by, path, root, all)` which mirrors how selenium's find_element(s)
+# translates each `By` strategy. Returns the first match (or null), or every match
+# when `all` is true.
+FIND_ELEMENTS = """
+var osfFind = function (by, path, root, all) {
+    root = root || document;
+    var quoted = function (value) {
+        return '"' + String(value).replace(/(["\\\\])/g, '\\\\$1') + '"';
+    };
+    var matches;
+    switch (by) {
+        case 'id':
+            matches = root.querySelectorAll('[id=' + quoted(path) + ']');
+            break;
+        case 'name':
+            matches = root.querySelectorAll('[name=' + quoted(path) + ']');
+            break;
+        case 'class name':
+            matches = root.querySelectorAll('.' + path);
+            break;
+        case 'tag name':
+        case 'css selector':
+            matches = root.querySelectorAll(path);
+            break;
+        case 'xpath':
+            var snapshot = document.evaluate(
+                path, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+            );
+            matches = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) {
+                matches.push(snapshot.snapshotItem(i));
+            }
+            break;
+        case 'link text':
+        case 'partial link text':
+            matches = Array.prototype.filter.call(
+                root.querySelectorAll('a'),
+                function (link) {
+                    var text = (link.innerText || link.textContent || '').trim();
+                    return by === 'link text' ? text === path : text.indexOf(path) !== -1;
+                }
+            );
+            break;
+        default:
+            throw new Error('Unsupported locator strategy: ' + by);
+    }
+    matches = Array.prototype.slice.call(matches);
+    return all ? matches : matches[0] || null;
+};
+"""
+
+# Defines `osfIsVisible(element)`, a close approximation of selenium's is_displayed
+# atom: the element is rendered, has a size (or a child with a size), is not
+# visibility:hidden and neither it nor an ancestor is fully transparent.
+IS_VISIBLE = """
+var osfIsVisible = function (element) {
+    if (!element || !element.isConnected) {
+        return false;
+    }
+    var tag = element.tagName.toUpperCase();
+    if (tag === 'OPTION' || tag === 'OPTGROUP') {
+        var select = element.closest('select');
+        return select ? osfIsVisible(select) : false;
+    }
+    if (element.getClientRects().length === 0) {
+        return false;
+    }
+    var hasSize = function (node) {
+        var rect = node.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    if (!hasSize(element) && !Array.prototype.some.call(
+        element.querySelectorAll('*'), hasSize
+    )) {
+        return false;
+    }
+    var style = window.getComputedStyle(element);
+    if (style.visibility === 'hidden' || style.visibility === 'collapse') {
+        return false;
+    }
+    for (var node = element; node && node.nodeType === 1; node = node.parentElement) {
+        if (window.getComputedStyle(node).opacity === '0') {
+            return false;
+        }
+    }
+    return true;
+};
+"""
+
+# Defines `osfStage(element, requireHref)` which returns how far an element (or null)
+# has got towards being ready to use: 'absent', 'present' (but not visible), 'visible'
+# (but disabled), 'clickable' (but without the href it needs) or 'ready'.
+ELEMENT_STAGE = (
+    IS_VISIBLE
+    + """
+var osfStage = function (element, requireHref) {
+    if (!element) {
+        return 'absent';
+    }
+    if (!osfIsVisible(element)) {
+        return 'present';
+    }
+    if (element.matches(':disabled')) {
+        return 'visible';
+    }
+    if (requireHref) {
+        var href = typeof element.href === 'string' ? element.href : element.getAttribute('href');
+        if (!href) {
+            return 'clickable';
+        }
+    }
+    return 'ready';
+};
+"""
+)
+
+# Runs every check `Locator.get_web_element` needs in one go. Arguments are the
+# selenium `By` strategy, the path, whether the element must have an href and the
+# element to search within (or null for the whole document).
+# Returns the furthest stage reached and, once ready, the element itself.
+ELEMENT_READINESS = (
+    FIND_ELEMENTS
+    + ELEMENT_STAGE
+    + """
+var element = osfFind(arguments[0], arguments[1], arguments[3], false);
+var stage = osfStage(element, arguments[2]);
+return stage === 'ready' ? {stage: stage, element: element} : {stage: stage};
+"""
+)
+
+# Checks that an element found earlier can be used again without searching for it:
+# it is still attached to the same page (`arguments[1]` is the url it was found on,
+# or null if not known yet) and still passes the readiness checks. Returns the
+# current url when it can be reused, otherwise null.
+CACHED_ELEMENT_READINESS = (
+    ELEMENT_STAGE
+    + """
+var element = arguments[0], url = arguments[1];
+if (!element.isConnected || (url !== null && url !== location.href)) {
+    return null;
+}
+return osfStage(element, arguments[2]) === 'ready' ? location.href : null;
+"""
+)
+
+# Reads the text, the given attributes and, optionally, the position and size of every
+# element matching a locator, and returns them along with the elements themselves.
+# Arguments are the selenium `By` strategy, the path, a list of attribute names, whether
+# to include rects, an optional CSS selector of a descendant of each element to read
+# the text and attributes from instead and an optional element to search within.
+EXTRACT_ELEMENTS = (
+    FIND_ELEMENTS
+    + IS_VISIBLE
+    + """
+var by = arguments[0], path = arguments[1], attributes = arguments[2];
+var withRects = arguments[3], descendant = arguments[4], root = arguments[5];
+return osfFind(by, path, root, true).map(function (element) {
+    var source = descendant ? element.querySelector(descendant) : element;
+    var item = {element: element, text: null, attributes: {}};
+    if (source) {
+        item.text = osfIsVisible(source) ? source.innerText.trim() : '';
+        attributes.forEach(function (name) {
+            item.attributes[name] = source.getAttribute(name);
+        });
+    }
+    if (withRects) {
+        var rect = element.getBoundingClientRect();
+        item.rect = {x: rect.x, y: rect.y, width: rect.width, height: rect.height};
+    }
+    return item;
+});
+"""
+)
+
+# Defines `osfSetValue(element, value)` which sets the value of an input, textarea or
+# select the way typing into it would: through the native value setter (so that
+# frameworks tracking the value notice the change), then firing `input` and `change`
+# events. Returns the element's value afterwards.
+SET_VALUE = """
+var osfSetValue = function (element, value) {
+    var prototype = Object.getPrototypeOf(element);
+    while (prototype && !Object.getOwnPropertyDescriptor(prototype, 'value')) {
+        prototype = Object.getPrototypeOf(prototype);
+    }
+    element.focus();
+    if (prototype) {
+        Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, value);
+    } else {
+        element.value = value;
+    }
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+    return element.value;
+};
+"""
+
+# Sets the value of an input (`arguments[0]`) to `arguments[1]` with `osfSetValue`.
+SET_INPUT_VALUE = (
+    SET_VALUE
+    + """
+return osfSetValue(arguments[0], arguments[1]);
+"""
+)
+
+# Returns the value of a textarea or a plain text input (`arguments[0]`), or null for any
+# other element, whose value doesn't simply hold what was typed into it.
+TEXT_INPUT_VALUE = """
+var element = arguments[0];
+var tag = element.tagName.toLowerCase();
+var type = (element.getAttribute('type') || 'text').toLowerCase();
+var textTypes = ['text', 'search', 'email', 'url', 'tel', 'password'];
+if (tag === 'textarea' || (tag === 'input' && textTypes.indexOf(type) !== -1)) {
+    return element.value;
+}
+return null;
+"""
+
+# Serialises a table into a list of rows of cell text. Works with a <table> (body rows
+# and their <td> cells) or an ARIA grid/table (role="row" elements and their
+# role="gridcell"/"cell" children). Arguments are the selenium `By` strategy and path of
+# the table and an optional string: when given, reading stops after the first row that
+# has a cell containing it. Returns {headers, rows}, or null if there is no such table.
+READ_TABLE = (
+    FIND_ELEMENTS
+    + """
+var table = osfFind(arguments[0], arguments[1], document, false), match = arguments[2];
+if (!table) {
+    return null;
+}
+var text = function (cell) {
+    return (cell.innerText || '').trim();
+};
+var rows, headers, cellsOf;
+if (table.tagName.toUpperCase() === 'TABLE') {
+    rows = table.querySelectorAll(':scope > tbody > tr');
+    headers = table.querySelectorAll(':scope > thead > tr > th');
+    cellsOf = function (row) {
+        return row.querySelectorAll(':scope > td');
+    };
+} else {
+    rows = Array.prototype.filter.call(
+        table.querySelectorAll('[role="row"]'),
+        function (row) {
+            return !row.querySelector('[role="columnheader"]');
+        }
+    );
+    headers = table.querySelectorAll('[role="columnheader"]');
+    cellsOf = function (row) {
+        return row.querySelectorAll('[role="gridcell"], [role="cell"]');
+    };
+}
+var result = {headers: Array.prototype.map.call(headers, text), rows: []};
+for (var i = 0; i < rows.length; i++) {
+    var cells = Array.prototype.map.call(cellsOf(rows[i]), text);
+    result.rows.push(cells);
+    if (match !== null && cells.some(function (cell) {
+        return cell.indexOf(match) !== -1;
+    })) {
+        break;
+    }
+}
+return result;
+"""
+)
+
+# Waits, inside the page, for a condition on the element(s) matching a locator and
+# returns as soon as it is met instead of polling from the test. The condition is
+# checked straight away, then again whenever a MutationObserver sees the DOM change (at
+# most once per animation frame) and on a slow interval, since visibility can also
+# change without a DOM mutation (e.g. CSS transitions).
+# Arguments are the condition name, the selenium `By` strategy, the path, the expected
+# value (text to contain, minimum count or whether an href is needed), how many
+# milliseconds to wait and the element to search within (or null for the whole
+# document). Resolves with {met, value, stage}.
+WAIT_FOR_CONDITION = (
+    FIND_ELEMENTS
+    + ELEMENT_STAGE
+    + """
+var condition = arguments[0], by = arguments[1], path = arguments[2];
+var expected = arguments[3], timeout = arguments[4], root = arguments[5];
+var done = arguments[arguments.length - 1];
+
+var check = function () {
+    if (condition === 'count') {
+        var count = osfFind(by, path, root, true).length;
+        return {met: count >= expected, value: count};
+    }
+    var element = osfFind(by, path, root, false);
+    switch (condition) {
+        case 'present':
+            return {met: !!element, value: element};
+        case 'visible':
+            return {met: osfIsVisible(element), value: element};
+        case 'ready':
+            var stage = osfStage(element, expected);
+            return {met: stage === 'ready', value: element, stage: stage};
+        case 'href':
+            var href = element && (
+                typeof element.href === 'string' ? element.href : element.getAttribute('href')
+            );
+            return {met: !!href, value: href};
+        case 'text':
+            var text = element ? element.innerText || '' : '';
+            return {met: text.indexOf(expected) !== -1, value: true};
+        case 'gone':
+            return {met: !osfIsVisible(element), value: true};
+    }
+    throw new Error('Unknown condition: ' + condition);
+};
+
+var result = check();
+if (result.met || timeout <= 0) {
+    done(result);
+    return;
+}
+var finished = false, scheduled = false, observer, timer, interval;
+var finish = function (result) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    clearInterval(interval);
+    done(result);
+};
+var recheck = function () {
+    scheduled = false;
+    var result = check();
+    if (result.met) {
+        finish(result);
+    }
+};
+observer = new MutationObserver(function () {
+    if (!scheduled) {
+        scheduled = true;
+        window.requestAnimationFrame(recheck);
+    }
+});
+observer.observe(document, {
+    subtree: true, childList: true, attributes: true, characterData: true
+});
+interval = setInterval(recheck, 100);
+timer = setTimeout(function () {
+    finish(check());
+}, timeout);
+"""
+)
+
+# Defines `window.osfNetwork`, which keeps track of XMLHttpRequest and fetch calls made
+# by the page: `pending` (by id) and the last 500 `finished` requests, each with its
+# method, absolute url, start and end times and status. `matches(request, pattern,
+# isRegex, method)` checks a request against a url pattern (a substring, or a regular
+# expression source when isRegex) and an optional method, and `listeners` are called
+# with each request as it finishes. Installing it again on the same page does nothing.
+NETWORK_SHIM = """
+if (!window.osfNetwork) {
+    (function () {
+        var network = window.osfNetwork = {
+            pending: {}, finished: [], listeners: [], count: 0
+        };
+        network.matches = function (request, pattern, isRegex, method) {
+            if (method && request.method !== method.toUpperCase()) {
+                return false;
+            }
+            if (pattern === null || pattern === undefined) {
+                return true;
+            }
+            return isRegex ? new RegExp(pattern).test(request.url)
+                : request.url.indexOf(pattern) !== -1;
+        };
+        var start = function (method, url) {
+            try {
+                url = new URL(url, location.href).href;
+            } catch (error) {
+                url = String(url);
+            }
+            var id = ++network.count;
+            network.pending[id] = {
+                id: id, method: String(method || 'GET').toUpperCase(), url: url,
+                started: Date.now(), ended: null, status: null
+            };
+            return id;
+        };
+        var finish = function (id, status) {
+            var request = network.pending[id];
+            if (!request) {
+                return;
+            }
+            delete network.pending[id];
+            request.ended = Date.now();
+            request.status = status;
+            network.finished.push(request);
+            if (network.finished.length > 500) {
+                network.finished.shift();
+            }
+            network.listeners.slice().forEach(function (listener) {
+                listener(request);
+            });
+        };
+
+        var open = XMLHttpRequest.prototype.open;
+        var send = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.open = function (method, url) {
+            this.osfRequest = {method: method, url: url};
+            return open.apply(this, arguments);
+        };
+        XMLHttpRequest.prototype.send = function () {
+            var xhr = this, details = this.osfRequest || {};
+            var id = start(details.method, details.url);
+            xhr.addEventListener('loadend', function () {
+                finish(id, xhr.status);
+            });
+            try {
+                return send.apply(this, arguments);
+            } catch (error) {
+                finish(id, 0);
+                throw error;
+            }
+        };
+
+        if (window.fetch) {
+            var fetch = window.fetch;
+            window.fetch = function (input, init) {
+                var method = (init && init.method) || (input && input.method);
+                var url = typeof input === 'string' ? input : (input && input.url) || input;
+                var id = start(method, url);
+                var request = fetch.apply(this, arguments);
+                request.then(function (response) {
+                    finish(id, response.status);
+                }, function () {
+                    finish(id, 0);
+                });
+                return request;
+            };
+        }
+    })();
+}
+"""
+
+# Waits until no request matching a url pattern has been in flight for a quiet period.
+# Arguments are the pattern (or null for any request), whether it is a regular
+# expression, the quiet period and how long to wait in total, both in milliseconds.
+# Resolves with {idle, pending} where pending lists the urls still in flight.
+WAIT_FOR_NETWORK_IDLE = (
+    NETWORK_SHIM
+    + """
+var pattern = arguments[0], isRegex = arguments[1];
+var quiet = arguments[2], timeout = arguments[3];
+var done = arguments[arguments.length - 1];
+var network = window.osfNetwork;
+
+var inFlight = function () {
+    return Object.keys(network.pending).map(function (id) {
+        return network.pending[id];
+    }).filter(function (request) {
+        return network.matches(request, pattern, isRegex, null);
+    }).map(function (request) {
+        return request.url;
+    });
+};
+
+var start = Date.now(), quietSince = null;
+var poll = function () {
+    var pending = inFlight(), now = Date.now();
+    if (pending.length) {
+        quietSince = null;
+    } else if (quietSince === null) {
+        quietSince = now;
+    }
+    if (quietSince !== null && now - quietSince >= quiet) {
+        done({idle: true, pending: []});
+    } else if (now - start >= timeout) {
+        done({idle: false, pending: pending});
+    } else {
+        setTimeout(poll, 25);
+    }
+};
+poll();
+"""
+)
+
+# Waits for a request matching a url pattern (and, optionally, a method) to finish and
+# resolves with it, or with null if none does in time. A finished request is only
+# returned once, so calling this again waits for the next matching request. Arguments
+# are the pattern, whether it is a regular expression, the method (or null) and how
+# many milliseconds to wait.
+WAIT_FOR_REQUEST = (
+    NETWORK_SHIM
+    + """
+var pattern = arguments[0], isRegex = arguments[1], method = arguments[2];
+var timeout = arguments[3];
+var done = arguments[arguments.length - 1];
+var network = window.osfNetwork;
+
+var take = function () {
+    for (var i = 0; i < network.finished.length; i++) {
+        var request = network.finished[i];
+        if (!request.seen && network.matches(request, pattern, isRegex, method)) {
+            request.seen = true;
+            return request;
+        }
+    }
+    return null;
+};
+
+var found = take();
+if (found || timeout <= 0) {
+    done(found);
+    return;
+}
+var timer;
+var listener = function () {
+    var found = take();
+    if (found) {
+        finish(found);
+    }
+};
+var finish = function (result) {
+    clearTimeout(timer);
+    network.listeners.splice(network.listeners.indexOf(listener), 1);
+    done(result);
+};
+network.listeners.push(listener);
+timer = setTimeout(function () {
+    finish(take());
+}, timeout);
+"""
+)
+
+# Defines `emberInstance()` and `emberRouter()`, which return the instance of the Ember
+# application booted on the page and its router, or null if there isn't one.
+EMBER_APP = """
+var emberInstance = function () {
+    if (!window.Ember || !Ember.Namespace || !Ember.Namespace.NAMESPACES) {
+        return null;
+    }
+    var apps = Ember.Namespace.NAMESPACES.filter(function (namespace) {
+        return namespace instanceof Ember.Application && namespace.__deprecatedInstance__;
+    });
+    return apps.length ? apps[0].__deprecatedInstance__ : null;
+};
+
+var emberRouter = function () {
+    var instance = emberInstance();
+    return instance ? instance.lookup('router:main') : null;
+};
+"""
+
+# Waits for the app to finish loading and rendering: the document has loaded, no jQuery
+# AJAX, XMLHttpRequest or fetch calls are in flight, Ember's run loop has nothing
+# scheduled and the Ember router is not in the middle of a transition. Each of these has
+# to stay true for a short quiet period, since one often kicks off the next (a
+# transition fetches a model, which schedules a render...).
+# Requests are tracked by NETWORK_SHIM, so any made before it was installed on the page
+# are only seen through jQuery.active.
+# Arguments are how many milliseconds to wait in total and how long the quiet period
+# is. Resolves with {settled, pending} where pending lists what was still busy.
+WAIT_FOR_SETTLED = (
+    NETWORK_SHIM
+    + EMBER_APP
+    + """
+var timeout = arguments[0], quiet = arguments[1];
+var done = arguments[arguments.length - 1];
+
+var pending = function () {
+    var busy = [];
+    if (document.readyState !== 'complete') {
+        busy.push('document');
+    }
+    if (window.jQuery && window.jQuery.active > 0) {
+        busy.push('jquery');
+    }
+    if (Object.keys(window.osfNetwork.pending).length > 0) {
+        busy.push('requests');
+    }
+    if (window.Ember && Ember.run) {
+        if (Ember.run.currentRunLoop || Ember.run.hasScheduledTimers()) {
+            busy.push('runloop');
+        }
+        var router = emberRouter();
+        var microlib = router && (router._routerMicrolib || router.router);
+        if (microlib && microlib.activeTransition) {
+            busy.push('transition');
+        }
+    }
+    return busy;
+};
+
+var start = Date.now(), quietSince = null;
+var poll = function () {
+    var busy;
+    try {
+        busy = pending();
+    } catch (error) {
+        busy = ['error: ' + error.message];
+    }
+    var now = Date.now();
+    if (busy.length) {
+        quietSince = null;
+    } else if (quietSince === null) {
+        quietSince = now;
+    }
+    if (quietSince !== null && now - quietSince >= quiet) {
+        done({settled: true, pending: []});
+    } else if (now - start >= timeout) {
+        done({settled: false, pending: busy});
+    } else {
+        setTimeout(poll, 25);
+    }
+};
+poll();
+"""
+)
+
+# Navigates to a url through the router of the Ember app already booted on the page,
+# instead of loading the page and booting the app again. Only urls on the same origin
+# are visited this way.
+# Arguments are the url and how many milliseconds to give the transition. Resolves with
+# {visited, reason}: visited is false, with the reason why, if there is no app on the
+# page, the url is elsewhere, or the transition failed, was redirected or timed out.
+# The router resolves a redirected transition like any other, so it is told apart by
+# the router's current url not being the one asked for (ignoring any hash and trailing
+# slash).
+VISIT_IN_APP = (
+    EMBER_APP
+    + """
+var url = arguments[0], timeout = arguments[1];
+var done = arguments[arguments.length - 1];
+
+var target = new URL(url, location.href);
+var instance = emberInstance();
+if (!instance) {
+    done({visited: false, reason: 'no app'});
+    return;
+}
+if (target.origin !== location.origin) {
+    done({visited: false, reason: 'other origin'});
+    return;
+}
+var router = instance.lookup('service:router') || emberRouter();
+var rootURL = router.rootURL || '/';
+var path = target.pathname + target.search + target.hash;
+if (rootURL !== '/' && path.indexOf(rootURL) === 0) {
+    path = '/' + path.slice(rootURL.length);
+}
+
+var withoutSlash = function (url) {
+    var parts = url.split('#')[0].split('?');
+    parts[0] = parts[0].replace(/(.)[/]+$/, '$1');
+    return parts.join('?');
+};
+var currentURL = function () {
+    return router.currentURL || router.url || '';
+};
+
+var finished = false;
+var finish = function (visited, reason) {
+    if (!finished) {
+        finished = true;
+        clearTimeout(timer);
+        done({visited: visited, reason: reason});
+    }
+};
+var timer = setTimeout(function () {
+    finish(false, 'timed out');
+}, timeout);
+try {
+    router.transitionTo(path).then(function () {
+        var current = currentURL();
+        if (withoutSlash(current) === withoutSlash(path)) {
+            finish(true, null);
+        } else {
+            finish(false, 'redirected to ' + current);
+        }
+    }, function (error) {
+        finish(false, String((error && error.message) || error));
+    });
+} catch (error) {
+    finish(false, String(error.message || error));
+}
+"""
+)
+
+# Runs the steps of a `base.macros.Macro` one after the other. Each step waits (polling
+# in the page) for its element, then acts on it:
+#   check 'ready': the element is visible and enabled
+#   check 'option': one of the elements has exactly `text` as its visible text and is
+#     ready, e.g. an option in a listbox
+#   check 'gone': the element is not visible
+#   action 'click': mouse down, mouse up and click, as Ember components listen for all
+#   action 'type': set the value to `text` (see `osfSetValue`)
+#   action 'wait': nothing, the check is the whole step
+# Arguments are the list of steps ({action, check, by, path, text, timeout}) and the
+# element to search within (or null for the whole document). Resolves with {ok} or,
+# when a step fails, {ok, step, stage, error} with the index of the step and how far its
+# element had got (or 'still visible', or 'error' if acting on it raised `error`).
+RUN_MACRO = (
+    FIND_ELEMENTS
+    + ELEMENT_STAGE
+    + SET_VALUE
+    + """
+var steps = arguments[0], root = arguments[1];
+var done = arguments[arguments.length - 1];
+
+var checks = {
+    ready: function (step) {
+        var element = osfFind(step.by, step.path, root, false);
+        var stage = osfStage(element, false);
+        return {met: stage === 'ready', element: element, stage: stage};
+    },
+    option: function (step) {
+        var options = osfFind(step.by, step.path, root, true).filter(function (option) {
+            return osfIsVisible(option) && option.innerText.trim() === step.text;
+        });
+        var stage = osfStage(options[0] || null, false);
+        return {met: stage === 'ready', element: options[0], stage: stage};
+    },
+    gone: function (step) {
+        var element = osfFind(step.by, step.path, root, false);
+        return {met: !osfIsVisible(element), stage: 'still visible'};
+    },
+    // Met once the element has been seen and gone again, or if it hasn't shown up
+    // within `step.appear` milliseconds
+    here_then_gone: function (step, start) {
+        if (osfIsVisible(osfFind(step.by, step.path, root, false))) {
+            step.seen = true;
+            return {met: false, stage: 'still visible'};
+        }
+        return {met: step.seen || Date.now() - start >= step.appear, stage: 'absent'};
+    }
+};
+
+var actions = {
+    click: function (element) {
+        element.scrollIntoView({block: 'center'});
+        ['mousedown', 'mouseup'].forEach(function (type) {
+            element.dispatchEvent(new MouseEvent(type, {
+                bubbles: true, cancelable: true, view: window, button: 0
+            }));
+        });
+        element.click();
+    },
+    type: function (element, step) {
+        osfSetValue(element, step.text);
+    },
+    wait: function () {}
+};
+
+var run = function (index) {
+    if (index === steps.length) {
+        done({ok: true});
+        return;
+    }
+    var step = steps[index], start = Date.now();
+    var poll = function () {
+        var result = checks[step.check](step, start);
+        if (!result.met) {
+            if (Date.now() - start < step.timeout) {
+                setTimeout(poll, 50);
+            } else {
+                done({ok: false, step: index, stage: result.stage});
+            }
+            return;
+        }
+        try {
+            actions[step.action](result.element, step);
+        } catch (error) {
+            done({ok: false, step: index, stage: 'error', error: String(error)});
+            return;
+        }
+        // Let the app react (e.g. render a listbox) before the next step looks for
+        // its element
+        setTimeout(function () {
+            run(index + 1);
+        }, 0);
+    };
+    poll();
+};
+run(0);
+"""
+)
+
+# Reads the Navigation Timing entry of the current page and its Resource Timing entries.
+# Times are in milliseconds since the navigation started (null if that point hasn't
+# been reached yet, while a resource's start or duration can be 0) and sizes in bytes
+# (0 for cached or cross-origin resources that don't allow timing). `now` is the time
+# the script ran.
+NAVIGATION_TIMING = """
+var round = function (value) {
+    return typeof value === 'number' && value >= 0 ? Math.round(value) : null;
+};
+// The navigation entry's marks are 0 until the point is reached
+var reached = function (value) {
+    return value > 0 ? Math.round(value) : null;
+};
+var navigation = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource').map(function (entry) {
+    return {
+        name: entry.name,
+        initiator_type: entry.initiatorType,
+        start: round(entry.startTime),
+        duration: round(entry.duration),
+        transfer_size: entry.transferSize || 0,
+    };
+});
+var result = {
+    url: location.href,
+    ttfb: null,
+    dom_content_loaded: null,
+    load: null,
+    transfer_size: null,
+    encoded_body_size: null,
+    decoded_body_size: null,
+    now: round(performance.now()),
+    resource_count: resources.length,
+    resource_transfer_size: resources.reduce(function (total, entry) {
+        return total + entry.transfer_size;
+    }, 0),
+    resources: resources
+};
+if (navigation) {
+    result.ttfb = reached(navigation.responseStart);
+    result.dom_content_loaded = reached(navigation.domContentLoadedEventEnd);
+    result.load = reached(navigation.loadEventEnd);
+    result.transfer_size = navigation.transferSize;
+    result.encoded_body_size = navigation.encodedBodySize;
+    result.decoded_body_size = navigation.decodedBodySize;
+}
+return result;
+"""
+
+# Counts the requests the current page made, or tried to make, to each of the hosts
+# given: the Resource Timing entries of anything loaded from them and the scripts,
+# stylesheets, images and frames on the page that point at them. Returns
+# {host: {requests, bytes}} for the hosts with any, where `bytes` adds up the transfer
+# sizes of the Resource Timing entries (0 for requests that failed, and for cross-origin
+# ones whose host doesn't allow timing).
+BLOCKED_REQUESTS = """
+var hosts = arguments[0];
+var counts = {}, seen = {};
+var count = function (url, bytes) {
+    var host;
+    try {
+        host = new URL(url, location.href).hostname;
+    } catch (error) {
+        return;
+    }
+    if (hosts.indexOf(host) === -1) {
+        return;
+    }
+    var entry = counts[host] = counts[host] || {requests: 0, bytes: 0};
+    entry.bytes += bytes;
+    if (!seen[url]) {
+        seen[url] = true;
+        entry.requests += 1;
+    }
+};
+performance.getEntriesByType('resource').forEach(function (entry) {
+    count(entry.name, entry.transferSize || entry.encodedBodySize || 0);
+});
+var elements = document.querySelectorAll(
+    'script[src], link[href], img[src], iframe[src]'
+);
+Array.prototype.forEach.call(elements, function (element) {
+    count(element.src || element.href, 0);
+});
+return counts;
+"""
+
+# Marks the current document as being left, then loads the url `arguments[0]` once the
+# script has returned, so that the driver doesn't wait for the page to load. The mark
+# goes when the new document replaces this one (see NEW_DOCUMENT).
+LEAVE_FOR = """
+var url = arguments[0];
+window.osfLeaving = true;
+setTimeout(function () { location.href = url; });
+"""
+
+# Returns null while the document left with LEAVE_FOR is still the live one, otherwise
+# how many milliseconds ago the new document's navigation started.
+NEW_DOCUMENT = 'return window.osfLeaving ? null : performance.now();'
+
+# Replaces the local storage of the current page with the items in `arguments[0]`.
+RESTORE_LOCAL_STORAGE = """
+var items = arguments[0];
+localStorage.clear();
+Object.keys(items).forEach(function (key) {
+    localStorage.setItem(key, items[key]);
+});
+"""
+
+# Asks the API (at `arguments[0]`), with the current page's cookies, who is logged in.
+# Resolves with their user id, or null if nobody is (or the API couldn't be reached).
+CURRENT_USER_ID = """
+var done = arguments[arguments.length - 1];
+fetch(arguments[0] + '/v2/users/me/', {credentials: 'include'})
+    .then(function (response) {
+        return response.ok ? response.json() : null;
+    })
+    .then(function (body) {
+        done(body && body.data ? body.data.id : null);
+    })
+    .catch(function () {
+        done(null);
+    });
+"""
+
+# Sets the Firefox preferences in `arguments[0]` ({name: value}). Runs in Firefox's
+# chrome context, where `Services` is available (imported on older versions).
+SET_FIREFOX_PREFS = """
+var preferences = arguments[0];
+var services = typeof Services !== 'undefined'
+    ? Services
+    : ChromeUtils.import('resource://gre/modules/Services.jsm').Services;
+Object.keys(preferences).forEach(function (name) {
+    var value = preferences[name];
+    if (typeof value === 'boolean') {
+        services.prefs.setBoolPref(name, value);
+    } else if (typeof value === 'number') {
+        services.prefs.setIntPref(name, value);
+    } else {
+        services.prefs.setCharPref(name, value);
+    }
+});
+"""
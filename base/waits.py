@@ -0,0 +1,243 @@
+import re
+import time
+import weakref
+
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.support.ui import WebDriverWait
+
+import settings
+from base import scripts
+
+
+# Script timeout (in seconds) last set on each driver, so it's only changed when a
+# longer wait needs it
+script_timeouts = weakref.WeakKeyDictionary()
+
+# Drivers that install the network shim on every new document themselves
+network_shim_drivers = weakref.WeakSet()
+
+
+class DomWait:
+    """A drop-in replacement for selenium's `WebDriverWait` for expected conditions that
+    can be checked inside the page.
+
+    Conditions with a `dom_condition` (see `base/expected_conditions.py`) are waited on by
+    a MutationObserver running in the page (`scripts.WAIT_FOR_CONDITION`), which returns
+    the moment the DOM matches, in one round trip, instead of polling every half second.
+    Any other condition, or any condition when `settings.EVENT_WAITS` is off, is polled
+    with a `WebDriverWait` as usual.
+
+    :param driver: A selenium WebDriver.
+    :param int timeout: How many seconds to wait before raising a `TimeoutException`.
+    """
+
+    def __init__(self, driver, timeout):
+        self.driver = driver
+        self.timeout = timeout
+
+    def until(self, condition, message=''):
+        dom_condition = getattr(condition, 'dom_condition', None)
+        if dom_condition is None or not settings.EVENT_WAITS:
+            return WebDriverWait(self.driver, self.timeout).until(condition, message)
+
+        end_time = time.monotonic() + self.timeout
+        set_script_timeout(self.driver, self.timeout)
+        try:
+            result = self.driver.execute_async_script(
+                scripts.WAIT_FOR_CONDITION,
+                dom_condition['name'],
+                dom_condition['locator'][0],
+                dom_condition['locator'][1],
+                dom_condition.get('expected'),
+                int(self.timeout * 1000),
+                dom_condition.get('root'),
+            )
+        except StaleElementReferenceException:
+            # The element to search within has gone, so let the caller find it again
+            raise
+        except WebDriverException:
+            # Most likely the page navigated away while the script was waiting (or the
+            # locator is invalid). Poll for whatever time is left so that the condition
+            # is checked on the new page and any real error surfaces as usual.
+            remaining = max(end_time - time.monotonic(), 0)
+            return WebDriverWait(self.driver, remaining).until(condition, message)
+
+        value = condition.dom_result(result)
+        if value:
+            return value
+        raise TimeoutException(message)
+
+
+class NegativeWaitStats:
+    """Running totals of the time spent waiting for elements to go away (`absent`) and,
+    in `here_then_gone`, for them to show up first, reported at the end of a test run.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.already_gone = 0
+        self.timed_out = 0
+        self.seconds = 0.0
+        self.appearance_seconds = 0.0
+
+    def record(self, seconds, already_gone, gone):
+        self.count += 1
+        self.already_gone += bool(already_gone)
+        self.timed_out += not gone
+        self.seconds += seconds
+
+    def summary(self):
+        return (
+            '{} negative waits took {:.1f}s ({} already gone on the first check, {} '
+            'timed out), plus {:.1f}s waiting for elements to appear first'.format(
+                self.count,
+                self.seconds,
+                self.already_gone,
+                self.timed_out,
+                self.appearance_seconds,
+            )
+        )
+
+
+negative_waits = NegativeWaitStats()
+
+
+def condition_met(driver, condition, timeout):
+    """Wait up to `timeout` seconds for `condition` with a `DomWait`.
+
+    :return: Whatever the condition returned, or False if it timed out.
+    """
+    try:
+        return DomWait(driver, timeout).until(condition)
+    except TimeoutException:
+        return False
+
+
+def set_script_timeout(driver, timeout):
+    """Make sure async scripts on `driver` can run for `timeout` seconds, leaving them
+    time to resolve on their own before selenium gives up on them.
+    """
+    timeout += 5
+    if script_timeouts.get(driver, 0) < timeout:
+        driver.set_script_timeout(timeout)
+        script_timeouts[driver] = timeout
+
+
+def wait_until_settled(driver, timeout=settings.TIMEOUT, quiet=0.1):
+    """Wait for the page to finish loading, fetching and rendering: no AJAX or fetch
+    requests in flight, nothing scheduled on Ember's run loop and no route transition
+    pending, for at least `quiet` seconds (see `scripts.WAIT_FOR_SETTLED`).
+
+    :return: True if the page settled, False if it was still busy after `timeout`
+        seconds or navigated away while waiting.
+    """
+    set_script_timeout(driver, timeout)
+    try:
+        result = driver.execute_async_script(
+            scripts.WAIT_FOR_SETTLED, int(timeout * 1000), int(quiet * 1000)
+        )
+    except WebDriverException:
+        return False
+    return result['settled']
+
+
+def visit_in_app(driver, url, timeout=settings.TIMEOUT):
+    """Navigate to `url` through the router of the Ember app already running on the page
+    (see `scripts.VISIT_IN_APP`), rather than loading it and booting the app again.
+
+    :return: True if the app transitioned to `url`, False if there was no app to do it
+        or the transition failed, in which case the url should be loaded as usual.
+    """
+    set_script_timeout(driver, timeout)
+    try:
+        result = driver.execute_async_script(
+            scripts.VISIT_IN_APP, url, int(timeout * 1000)
+        )
+    except WebDriverException:
+        return False
+    return result['visited']
+
+
+def preinstall_network_shim(driver):
+    """Where the driver supports the Chrome DevTools protocol, register the network shim
+    (see `scripts.NETWORK_SHIM`) to run before any of the page's own scripts on every
+    page loaded from then on, so that no request is missed.
+
+    :return: True if the shim will be in every page loaded from now on.
+    """
+    if driver not in network_shim_drivers and hasattr(driver, 'execute_cdp_cmd'):
+        try:
+            driver.execute_cdp_cmd(
+                'Page.addScriptToEvaluateOnNewDocument',
+                {'source': scripts.NETWORK_SHIM},
+            )
+            network_shim_drivers.add(driver)
+        except WebDriverException:
+            pass
+    return driver in network_shim_drivers
+
+
+def install_network_shim(driver):
+    """Start tracking the requests made by the current page (see `scripts.NETWORK_SHIM`).
+
+    Also preinstalls the shim where the driver supports it (see `preinstall_network_shim`).
+    Elsewhere it only sees requests made after it is injected.
+    """
+    preinstall_network_shim(driver)
+    driver.execute_script(scripts.NETWORK_SHIM)
+
+
+def url_pattern(pattern):
+    """Split a url pattern into what the network scripts take: the pattern's source and
+    whether it is a regular expression (a compiled `re.Pattern`) or a plain substring.
+    """
+    if isinstance(pattern, re.Pattern):
+        return pattern.pattern, True
+    return pattern, False
+
+
+def wait_for_network_idle(driver, pattern=None, timeout=settings.TIMEOUT, quiet=0.1):
+    """Wait until no request whose url matches `pattern` (any request if None) has been
+    in flight for `quiet` seconds.
+
+    :param pattern: A substring of the url, or a compiled regular expression.
+    :return: True if the network went idle, False if requests were still in flight
+        after `timeout` seconds or the page navigated away while waiting.
+    """
+    set_script_timeout(driver, timeout)
+    try:
+        result = driver.execute_async_script(
+            scripts.WAIT_FOR_NETWORK_IDLE,
+            *url_pattern(pattern),
+            int(quiet * 1000),
+            int(timeout * 1000),
+        )
+    except WebDriverException:
+        return False
+    return result['idle']
+
+
+def wait_for_request(driver, pattern, method=None, timeout=settings.TIMEOUT):
+    """Wait for a request whose url matches `pattern` to finish. Each finished request
+    is only returned once, so a second call waits for the next matching request.
+
+    :param pattern: A substring of the url, or a compiled regular expression.
+    :param str method: Only match requests made with this HTTP method.
+    :return: A dict with the request's `method`, `url`, `status` and its `started` and
+        `ended` times (in ms since the epoch), or None if no matching request finished
+        within `timeout` seconds.
+    """
+    set_script_timeout(driver, timeout)
+    try:
+        return driver.execute_async_script(
+            scripts.WAIT_FOR_REQUEST,
+            *url_pattern(pattern),
+            method,
+            int(timeout * 1000),
+        )
+    except WebDriverException:
+        return None
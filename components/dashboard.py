@@ -1,5 +1,3 @@
-from time import sleep
-
 from selenium.webdriver.common.by import By
 
 import settings
@@ -8,6 +6,7 @@ from base.locators import (
     GroupLocator,
     Locator,
 )
+from base.waits import wait_until_settled
 
 
 class EmberCreateProjectModal(BaseElement):
@@ -183,5 +182,6 @@ class ProjectList(BaseElement):
             raise ValueError('Unable to find a project at position {}'.format(n))
 
     def get_list_length(self):
-        sleep(0.4)  # Need sleep to let quicksearch do its thing
+        # Let quicksearch do its thing
+        wait_until_settled(self.driver, settings.QUICK_TIMEOUT)
         return len(self.project_list_projects)
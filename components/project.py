@@ -96,14 +96,13 @@ class CreateRegistrationModal(BaseElement):
 
     def get_schema_names_list(self):
         """Returns the schema names from the schema list"""
-        return [schema.text for schema in self.schema_list]
+        return self.schema_list.texts()
 
     def select_schema_radio_button(self, schema_name='Open-Ended Registration'):
         """Selects the radio button corresponding to the given schema name"""
-        for schema in self.schema_list:
-            if schema.text == schema_name:
-                schema.find_element_by_css_selector('[type="radio"]').click()
-                break
+        schema = self.schema_list.find_by_text(schema_name)
+        if schema:
+            schema.find_element_by_css_selector('[type="radio"]').click()
 
 
 class ConfirmDeleteDraftRegistrationModal(BaseElement):
@@ -146,6 +145,14 @@ class MoveCopyFileModal(BaseElement):
     in_process_ind = Locator(By.CSS_SELECTOR, '[data-icon="spinner"]')
     done_button = Locator(By.CSS_SELECTOR, '[data-test-move-done-button]')
 
+    def move_copy_to_osfstorage(self):
+        """Go up to the project level, open OSF Storage and start moving (or copying)
+        the selected files there.
+        """
+        self.macro().click('project_link').click(
+            'provider_osfstorage_link'
+        ).here_then_gone('loading_indicator').click('move_copy_button').run()
+
 
 class RenameFileModal(BaseElement):
     rename_input_box = Locator(By.CSS_SELECTOR, '[data-test-user-input]')
@@ -6,6 +6,9 @@ import settings
 two_minute_drill = pytest.mark.two_minute_drill
 smoke_test = pytest.mark.smoke_test
 core_functionality = pytest.mark.core_functionality
+# Tests that don't need images or fonts, even when LEAN_BROWSER is off, and tests that do
+lean_browser = pytest.mark.lean_browser
+full_browser = pytest.mark.full_browser
 dont_run_on_prod = pytest.mark.skipif(
     settings.PRODUCTION, reason='Test should not run on production'
 )
@@ -7,10 +7,15 @@ from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
 
 import settings
+from base import waits
 from base.exceptions import (
     HttpError,
     PageException,
 )
+from base.instrumentation import (
+    blocked_requests,
+    navigation_timings,
+)
 from base.locators import (
     BaseElement,
     ComponentLocator,
@@ -21,22 +26,88 @@ from components.navbars import HomeNavbar
 class BasePage(BaseElement):
     url = None
 
+    # Latency budgets, in milliseconds from the start of navigation to the load event and
+    # to the app settling after `goto` (see `base.instrumentation.LatencyBudgets`)
+    load_budget_ms = None
+    settled_budget_ms = None
+
+    # Whether the page is a route of the Ember app, so `goto` can navigate to it in the
+    # app. Only set on pages that are always served by the app, e.g. the Ember version
+    # picked by `waffle_override` when its flag is on. The registries, preprints and
+    # collections pages aren't marked until the waffle flags they're served under are
+    # known to this suite.
+    ember_route = False
+
     def __init__(self, driver, verify=False):
         super().__init__(driver)
 
         if verify:
             self.check_page()
 
-    def goto(self, expect_redirect_to=None):
+    def goto(
+        self,
+        expect_redirect_to=None,
+        settled=None,
+        in_app=settings.IN_APP_NAVIGATION,
+        reload=True,
+    ):
         """Navigate to a page based on its `url` attribute
         and confirms you are on the expected page.
 
         If you are not actually expecting to end up on the page you attempt to `goto`
         (for example when testing permissions) you can set `expect_redirect_to` equal to
         any BasePage class and it will be verified you wind up on that page instead.
+
+        If `settled` is True, wait up to `settings.SETTLED_TIMEOUT` seconds (or for as
+        long as the page's `settled_budget_ms`, if longer and `settings.LATENCY_BUDGETS`
+        is on) for the app to finish loading
+        first (see `wait_until_settled`). Where the network shim was in the
+        page from the start (see `waits.preinstall_network_shim`), so that every request
+        the app made while booting was seen, a settled page is then checked without
+        waiting for its identity. Otherwise, or if it doesn't settle in time, the page is
+        checked the usual way. If `settled` is None (the default), it is
+        `settings.WAIT_FOR_SETTLED` where the shim was in the page from the start and
+        False elsewhere, as there the identity is waited for anyway.
+
+        If `in_app` is True and the page is an `ember_route`, navigate to it through the
+        Ember app already running in the browser (see `waits.visit_in_app`) instead of
+        loading it. If there is no app running, or it can't get to the page, the page is
+        loaded as usual. The page is checked the same way either way.
+
+        If `reload` is False and the browser is already at the page's url, the page is
+        only checked, not loaded again.
+
+        The page's load timings are then logged if `settings.NAVIGATION_TIMINGS` is set,
+        and checked against its latency budgets and `settings.LATENCY_BASELINE`. They
+        aren't for pages navigated to in the app, since the page wasn't loaded. Nor are
+        the requests it made to third-party hosts blocked by `settings.BLOCK_THIRD_PARTY`.
         """
 
-        self.driver.get(self.url)
+        self.clear_element_cache()
+        if (
+            not reload
+            and not expect_redirect_to
+            and self.driver.current_url == self.url
+        ):
+            self.check_page()
+            return
+        preinstalled = waits.preinstall_network_shim(self.driver)
+        in_app = (
+            in_app and self.ember_route and waits.visit_in_app(self.driver, self.url)
+        )
+        if not in_app:
+            self.driver.get(self.url)
+        waits.install_network_shim(self.driver)
+        if settled is None:
+            settled = settings.WAIT_FOR_SETTLED and preinstalled
+        if settled:
+            timeout = settings.SETTLED_TIMEOUT
+            if settings.LATENCY_BUDGETS and self.settled_budget_ms:
+                # Give the page long enough to tell whether it goes over its budget
+                timeout = max(timeout, self.settled_budget_ms / 1000)
+            settled = self.wait_until_settled(timeout)
+        else:
+            settled = None
 
         if expect_redirect_to:
             if (
@@ -48,7 +119,10 @@ class BasePage(BaseElement):
                 )
             expect_redirect_to(self.driver, verify=True)
         else:
-            self.check_page()
+            self.check_page(wait=not (settled and preinstalled))
+        if not in_app:
+            navigation_timings.record(self, settled)
+            blocked_requests.record(self)
 
     def goto_with_reload(self):
         """An extension of the goto method above to be used in instances where the first attempt
@@ -66,24 +140,53 @@ class BasePage(BaseElement):
             self.reload()
             self.goto()
 
-    def check_page(self):
-        if not self.verify():
+    def check_page(self, wait=True):
+        if not self.verify(wait):
             # handle any specific kind of error before go to page exception
             self.error_handling()
             raise PageException(
                 'Unexpected page structure: `{}`'.format(self.driver.current_url)
             )
 
-    def verify(self):
+    def verify(self, wait=True):
         """Verify that you are on the expected page by confirming the page's `identity`
         element is present on the page.
+
+        :param bool wait: If False, check just once instead of waiting for the identity
+            to appear.
+        """
+        return self.identity.present(wait)
+
+    def wait_until_settled(self, timeout=settings.TIMEOUT):
+        """Wait for the app to finish loading, fetching and rendering: no AJAX or fetch
+        requests in flight, nothing scheduled on Ember's run loop and no route
+        transition pending. Use instead of waiting for a page's loading indicator.
+
+        :return: True if the page settled, False if still busy after `timeout` seconds.
+        """
+        return waits.wait_until_settled(self.driver, timeout)
+
+    def wait_for_network_idle(self, pattern=None, timeout=settings.TIMEOUT):
+        """Wait until no request whose url matches `pattern` (a substring or a compiled
+        regular expression, any request if None) is in flight.
+
+        :return: True if the network went idle, False if still busy after `timeout`.
+        """
+        return waits.wait_for_network_idle(self.driver, pattern, timeout)
+
+    def wait_for_request(self, pattern, method=None, timeout=settings.TIMEOUT):
+        """Wait for the next request whose url matches `pattern` (a substring or a
+        compiled regular expression) and, if given, `method` to finish.
+
+        :return: The request's `method`, `url` and `status`, or None on timeout.
         """
-        return self.identity.present()
+        return waits.wait_for_request(self.driver, pattern, method, timeout)
 
     def error_handling(self):
         pass
 
     def reload(self):
+        self.clear_element_cache()
         self.driver.refresh()
 
     def scroll_into_view(self, element):
@@ -32,13 +32,13 @@ class BaseCollectionPage(OSFBasePage):
         """Set the URL based on the provider domain."""
         return urljoin(self.base_url, self.provider_id) + '/' + self.url_addition
 
-    def verify(self):
+    def verify(self, wait=True):
         """Return true if you are on the expected page.
         Checks both the general page identity and the branding.
         """
         if self.provider:
-            return super().verify() and self.provider_name in self.navbar.title.text
-        return super().verify()
+            return super().verify(wait) and self.provider_name in self.navbar.title.text
+        return super().verify(wait)
 
 
 class CollectionDiscoverPage(BaseCollectionPage):
@@ -40,4 +40,6 @@ class DashboardPage(OSFBasePage):
     navbar = ComponentLocator(EmberNavbar)
     create_project_modal = ComponentLocator(components.EmberCreateProjectModal)
     project_created_modal = ComponentLocator(components.EmberProjectCreatedModal)
-    project_list = ComponentLocator(components.EmberProjectList, settings.LONG_TIMEOUT)
+    project_list = ComponentLocator(
+        components.EmberProjectList, timeout=settings.LONG_TIMEOUT
+    )
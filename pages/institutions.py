@@ -88,7 +88,7 @@ class InstitutionAdminDashboardPage(BaseInstitutionPage):
     )
 
     def select_department_from_listbox(self, department):
-        for option in self.department_options:
-            if option.text == department:
-                option.click()
-                break
+        """Open the Departments listbox and select `department`."""
+        self.macro().click('departments_listbox_trigger').select(
+            'department_options', department
+        ).run()
@@ -1,6 +1,18 @@
+import hashlib
+import json
+import os
+import re
+import time
+
 from selenium.webdriver.common.by import By
 
 import settings
+from api import osf_api
+from base import (
+    scripts,
+    waits,
+)
+from base.browser_state import browser_state
 from base.exceptions import LoginError
 from base.locators import (
     GroupLocator,
@@ -153,19 +165,268 @@ class CASAuthorizationPage(BasePage):
     deny_button = Locator(By.ID, 'deny')
 
 
+# The OSF session cookie of each user logged in with `safe_login` this run, to log them
+# in again without going through CAS (see `cookie_login`)
+login_cookies = {}
+# The OSF local storage of each user switched to with `use_persona`, restored along with
+# their session cookie
+login_storage = {}
+# The OSF id of each user, to check who a session cookie logs in as
+user_ids = {}
+
+# The cookie that hides the cookie banner, kept when the other cookies are cleared
+COOKIE_CONSENT = 'osf_cookieconsent'
+# The browser state flag of a browser that has logged in through CAS since its CAS
+# cookies were last cleared
+CAS_LOGIN = 'cas_login'
+
+# The users tests can switch between with `use_persona`, and how to log in as each
+personas = {
+    'user_one': (settings.USER_ONE, settings.USER_ONE_PASSWORD),
+    'user_two': (settings.USER_TWO, settings.USER_TWO_PASSWORD),
+    'registration_user': (
+        settings.REGISTRATIONS_USER,
+        settings.REGISTRATIONS_USER_PASSWORD,
+    ),
+}
+
+
+def session_cookie_name():
+    """The name of OSF's session cookie: `osf` in production, and `osf_<environment>`
+    (e.g. `osf_staging`) elsewhere.
+    """
+    if settings.PRODUCTION:
+        return 'osf'
+    # In the testing environments the cookie name contains the environment, so parse
+    # out the environment from the OSF_HOME url.
+    match = re.search(r'(.*)\.osf\.io', settings.OSF_HOME[8:])
+    return 'osf_' + match.group(1)
+
+
 def login(driver, user=settings.USER_ONE, password=settings.USER_ONE_PASSWORD):
+    state = browser_state(driver)
+    # Whoever ends up logged in, it's no longer known for sure
+    state.user = None
+    state.flags.add(CAS_LOGIN)
     login_page = LoginPage(driver)
     login_page.goto()
     login_page.submit_login(user, password)
 
 
-def safe_login(driver, user=settings.USER_ONE, password=settings.USER_ONE_PASSWORD):
-    """Raise a LoginError if login fails."""
-    login(driver, user=user, password=password)
-    if not OSFBasePage(driver).is_logged_in():
-        raise LoginError('Login failed')
+def on_osf(driver):
+    """Whether the browser is on a page of OSF, where its OSF cookies can be read."""
+    return driver.current_url.startswith(settings.OSF_HOME)
+
+
+def logged_in_as(driver, user):
+    """Whether `user` is still logged in from the last `safe_login`, going by the
+    browser's state and its session cookie (so without loading a page).
+    """
+    state = browser_state(driver)
+    if state.user != user or state.session is None or not on_osf(driver):
+        return False
+    cookie = driver.get_cookie(session_cookie_name())
+    return cookie is not None and cookie['value'] == state.session
+
+
+def user_id(user, password):
+    """The OSF id of `user`, looked up through the API the first time."""
+    if user not in user_ids:
+        user_ids[user] = osf_api.current_user(osf_api.get_session(user, password)).id
+    return user_ids[user]
+
+
+def cookie_login(driver, user, password):
+    """Log in as `user` by giving the browser the session cookie captured when they
+    last logged in with `safe_login` (and their local storage, if `use_persona` kept
+    it), then loading the OSF home page.
+
+    :return: True if that logged the browser in as `user`, False if there is no cookie
+        for `user` or it has expired or logs in as someone else (in which case it's
+        forgotten) and they must log in through CAS.
+    """
+    cookie = login_cookies.get(user)
+    if cookie is None:
+        return False
+    if not cookie.get('expiry') or cookie['expiry'] > time.time():
+        if not on_osf(driver):
+            # Cookies can only be set on a page of their own domain
+            driver.get(settings.OSF_HOME + '/robots.txt')
+        driver.delete_cookie(cookie['name'])
+        driver.add_cookie(cookie)
+        if user in login_storage:
+            driver.execute_script(scripts.RESTORE_LOCAL_STORAGE, login_storage[user])
+        driver.get(settings.OSF_HOME)
+        if logged_in_user_id(driver) == user_id(user, password):
+            return True
+    # The session has ended on the server, or isn't theirs
+    del login_cookies[user]
+    login_storage.pop(user, None)
+    return False
+
+
+def logged_in_user_id(driver):
+    """The OSF id of the user the browser is logged in as, asked of the API from the
+    OSF page the browser is on. None if it isn't logged in.
+    """
+    waits.set_script_timeout(driver, settings.TIMEOUT)
+    return driver.execute_async_script(scripts.CURRENT_USER_ID, settings.API_DOMAIN)
+
+
+def safe_login(
+    driver,
+    user=settings.USER_ONE,
+    password=settings.USER_ONE_PASSWORD,
+    use_cache=settings.LOGIN_COOKIE_CACHE,
+):
+    """Raise a LoginError if login fails. Does nothing if `user` is still logged in
+    from the last time (see `logged_in_as`).
+
+    If `use_cache` is True, log in with the session cookie from the user's last login
+    this run while it's still good (see `cookie_login`), and keep the cookie from a
+    login through CAS for next time.
+    """
+    if logged_in_as(driver, user):
+        return
+    if not (use_cache and cookie_login(driver, user, password)):
+        login(driver, user=user, password=password)
+        if not OSFBasePage(driver).is_logged_in():
+            raise LoginError('Login failed')
+    remember_login(driver, user, use_cache)
+
+
+def remember_login(driver, user, use_cache=settings.LOGIN_COOKIE_CACHE):
+    """Note that `user` has just logged in, in the browser's state and, if `use_cache`
+    is True, in the cookies kept for `cookie_login`.
+    """
+    cookie = driver.get_cookie(session_cookie_name())
+    if use_cache and cookie:
+        login_cookies[user] = cookie
+    state = browser_state(driver)
+    state.user = user
+    state.session = cookie['value'] if cookie else None
+
+
+def delete_cookies(driver):
+    """Delete the cookies of the site the browser is on, but the cookie consent one."""
+    for cookie in driver.get_cookies():
+        if cookie['name'] != COOKIE_CONSENT:
+            driver.delete_cookie(cookie['name'])
+
+
+def forget_login(driver):
+    """Log the browser out by deleting its OSF cookies, leaving the session on the
+    server alive for `cookie_login`.
+
+    Its CAS cookies are only deleted (which takes loading a CAS page) if it may have
+    logged in through CAS: after `login`, or if its session isn't one `cookie_login`
+    set (e.g. after a test logged in on the CAS pages itself).
+    """
+    if not on_osf(driver):
+        # Cookies can only be read and deleted on a page of their own domain
+        driver.get(settings.OSF_HOME + '/robots.txt')
+    session = driver.get_cookie(session_cookie_name())
+    delete_cookies(driver)
+    state = browser_state(driver)
+    cached = {cookie['value'] for cookie in login_cookies.values()}
+    if CAS_LOGIN in state.flags or (
+        session is not None and session['value'] not in cached
+    ):
+        driver.get(settings.CAS_DOMAIN + '/robots.txt')
+        delete_cookies(driver)
+        state.flags.discard(CAS_LOGIN)
 
 
 def logout(driver):
-    """Log the user out."""
-    driver.get(settings.OSF_HOME + '/logout/')
+    """Log the user out. Does nothing if the browser is still logged out from the last
+    time.
+
+    While there are logins cached for `cookie_login`, this only deletes the browser's
+    cookies (see `forget_login`), since logging out through OSF would end the session.
+    """
+    state = browser_state(driver)
+    if (
+        state.user == ''
+        and on_osf(driver)
+        and driver.get_cookie(session_cookie_name()) is None
+    ):
+        return
+    if login_cookies:
+        forget_login(driver)
+    else:
+        driver.get(settings.OSF_HOME + '/logout/')
+    state.user = ''
+    state.session = None
+
+
+def persona_path(name, user):
+    # Keyed by user too, so that a persona's snapshot isn't used once its user changes
+    digest = hashlib.sha256(user.encode()).hexdigest()[:12]
+    return os.path.join(
+        settings.PERSONA_DIR, '{}-{}-{}.json'.format(settings.DOMAIN, name, digest)
+    )
+
+
+def snapshot_persona(driver, name, user):
+    """Keep the OSF local storage of the browser, just logged in as persona `name`'s
+    `user`, to restore along with their session cookie, and save both to
+    `settings.PERSONA_DIR` if that's set.
+    """
+    login_storage[user] = driver.execute_script(
+        'return Object.assign({}, window.localStorage);'
+    )
+    if settings.PERSONA_DIR:
+        os.makedirs(settings.PERSONA_DIR, exist_ok=True)
+        # The snapshot holds a live session cookie, so keep it private
+        descriptor = os.open(
+            persona_path(name, user), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+        )
+        with open(descriptor, 'w') as snapshot_file:
+            json.dump(
+                {
+                    'user': user,
+                    'cookie': login_cookies[user],
+                    'local_storage': login_storage[user],
+                },
+                snapshot_file,
+            )
+
+
+def load_persona(name, user):
+    """Load the session cookie and local storage of persona `name`'s `user` saved to
+    `settings.PERSONA_DIR` by an earlier run, unless there's already a cookie for them.
+    """
+    if user in login_cookies or not settings.PERSONA_DIR:
+        return
+    try:
+        with open(persona_path(name, user)) as snapshot_file:
+            snapshot = json.load(snapshot_file)
+    except FileNotFoundError:
+        return
+    if snapshot['user'] == user:
+        login_cookies[user] = snapshot['cookie']
+        login_storage[user] = snapshot['local_storage']
+
+
+def use_persona(driver, name):
+    """Switch the browser to persona `name`: one of `personas`, or 'anonymous' to log
+    out.
+
+    The first time, the persona logs in through CAS and its session cookie and local
+    storage are kept. After that (and in later runs, if `settings.PERSONA_DIR` is set)
+    switching to it restores them with a single page load instead (see
+    `cookie_login`), unless its session has ended.
+    """
+    if name == 'anonymous':
+        logout(driver)
+        return
+    user, password = personas[name]
+    if logged_in_as(driver, user):
+        return
+    load_persona(name, user)
+    if cookie_login(driver, user, password):
+        remember_login(driver, user, use_cache=True)
+        return
+    logout(driver)
+    safe_login(driver, user=user, password=password, use_cache=True)
+    snapshot_persona(driver, name, user)
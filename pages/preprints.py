@@ -44,13 +44,13 @@ class BasePreprintPage(OSFBasePage):
                 )
         return self.base_url + self.url_addition
 
-    def verify(self):
+    def verify(self, wait=True):
         """Return true if you are on the expected page.
         Checks both the general page identity and the branding.
         """
         if self.provider and self.provider_id != 'osf':
-            return super().verify() and self.provider_name in self.navbar.title.text
-        return super().verify()
+            return super().verify(wait) and self.provider_name in self.navbar.title.text
+        return super().verify(wait)
 
 
 class PreprintLandingPage(BasePreprintPage):
@@ -100,10 +100,7 @@ class PreprintSubmitPage(BasePreprintPage):
     )
 
     def select_from_dropdown_listbox(self, selection):
-        for option in self.dropdown_options:
-            if option.text == selection:
-                option.click()
-                break
+        self.macro().select('dropdown_options', selection).run()
 
     top_level_subjects = GroupLocator(
         By.CSS_SELECTOR, 'div[data-analytics-scope="Browse"] > ul > li'
@@ -113,14 +110,13 @@ class PreprintSubmitPage(BasePreprintPage):
     )
 
     def select_top_level_subject(self, selection):
-        for subject in self.top_level_subjects:
-            if subject.text == selection:
-                # Find the checkbox element and click it to select the subject
-                checkbox = subject.find_element_by_css_selector(
-                    'input.ember-checkbox.ember-view'
-                )
-                checkbox.click()
-                break
+        subject = self.top_level_subjects.find_by_text(selection)
+        if subject:
+            # Find the checkbox element and click it to select the subject
+            checkbox = subject.find_element_by_css_selector(
+                'input.ember-checkbox.ember-view'
+            )
+            checkbox.click()
 
     first_selected_subject = Locator(By.CSS_SELECTOR, 'li[data-test-selected-subject]')
     basics_tags_section = Locator(By.CSS_SELECTOR, '[data-test-no-tags]')
@@ -205,10 +201,9 @@ class PreprintEditPage(PreprintSubmitPage):
         subject). This function would need to be modified or another separate function
         created to select from either of the 2 secondary subject boxes.
         """
-        for subject in self.primary_subjects:
-            if subject.text == subject_name:
-                subject.click()
-                break
+        subject = self.primary_subjects.find_by_text(subject_name)
+        if subject:
+            subject.click()
 
 
 class PreprintWithdrawPage(GuidBasePage, BasePreprintPage):
@@ -260,6 +255,8 @@ class BrandedPreprintsDiscoverPage(BasePreprintPage):
 
 class PreprintDetailPage(GuidBasePage, BasePreprintPage):
     url_base = urljoin(settings.OSF_HOME, '{guid}')
+    load_budget_ms = 5000
+    settled_budget_ms = 10000
     identity = Locator(
         By.CSS_SELECTOR,
         '[data-test-preprint-header]',
@@ -357,13 +354,13 @@ class BaseReviewsPage(OSFBasePage):
         """Set the URL based on the provider domain."""
         return urljoin(self.base_url, self.provider_id) + '/' + self.url_addition
 
-    def verify(self):
+    def verify(self, wait=True):
         """Return true if you are on the expected page.
         Checks both the general page identity and the branding.
         """
         if self.provider:
-            return super().verify() and self.provider_name in self.title.text
-        return super().verify()
+            return super().verify(wait) and self.provider_name in self.title.text
+        return super().verify(wait)
 
 
 class ReviewsSubmissionsPage(BaseReviewsPage):
@@ -42,6 +42,8 @@ from pages.base import (
 
 
 class ProjectPage(GuidBasePage):
+    load_budget_ms = 5000
+    settled_budget_ms = 8000
 
     identity = Locator(By.ID, 'projectScope')
     title = Locator(By.ID, 'nodeTitleEditable', settings.LONG_TIMEOUT)
@@ -82,20 +84,18 @@ class ProjectPage(GuidBasePage):
     components = GroupLocator(By.ID, 'render-node')
 
     # Components
-    file_widget = ComponentLocator(FileWidget)
-    log_widget = ComponentLocator(LogWidget)
+    file_widget = ComponentLocator(FileWidget, By.ID, 'treeGrid')
+    log_widget = ComponentLocator(LogWidget, By.XPATH, '//*[@id="logFeed"]/..')
     confirm_privacy_change_modal = ComponentLocator(ConfirmPrivacyChangeModal)
     components_privacy_change_modal = ComponentLocator(ComponentsPrivacyChangeModal)
     create_component_modal = ComponentLocator(CreateComponentModal)
     component_created_modal = ComponentLocator(ComponentCreatedModal)
-    delete_component_modal = ComponentLocator(DeleteComponentModal)
+    delete_component_modal = ComponentLocator(
+        DeleteComponentModal, By.ID, 'nodesDelete'
+    )
 
     def get_component_by_node_id(self, node_id):
-        for component in self.components:
-            if node_id == component.find_element_by_css_selector('div').get_attribute(
-                'node_id'
-            ):
-                return component
+        return self.components.find_by_attribute('node_id', node_id, descendant='div')
 
 
 def verify_log_entry(session, driver, node_id, action, **kwargs):
@@ -534,10 +534,7 @@ class FilesMetadataPage(GuidBasePage):
     )
 
     def select_from_dropdown_listbox(self, selection):
-        for option in self.dropdown_options:
-            if option.text == selection:
-                option.click()
-                break
+        self.macro().select('dropdown_options', selection).run()
 
     cancel_editing_button = Locator(
         By.CSS_SELECTOR, '[data-test-cancel-editing-metadata-button]'
@@ -587,10 +584,7 @@ class ProjectMetadataPage(GuidBasePage):
     )
 
     def select_from_dropdown_listbox(self, selection):
-        for option in self.dropdown_options:
-            if option.text == selection:
-                option.click()
-                break
+        self.macro().select('dropdown_options', selection).run()
 
     resource_information_save_button = Locator(
         By.CSS_SELECTOR, '[data-test-save-resource-metadata-button]'
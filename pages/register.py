@@ -10,6 +10,7 @@ from pages.base import OSFBasePage
 
 
 class EmberRegisterPage(OSFBasePage):
+    ember_route = True
     url = settings.OSF_HOME + '/register'
 
     identity = Locator(By.CSS_SELECTOR, '._sign-up-container_19kgff')
@@ -46,10 +46,6 @@ class MyRegistrationsPage(OSFBasePage):
     registration_cards = GroupLocator(By.CSS_SELECTOR, 'div[data-test-node-card]')
 
     def get_registration_card_by_title(self, title):
-        for registration_card in self.registration_cards:
-            node_title = registration_card.find_element_by_css_selector(
-                '[data-test-node-title]'
-            )
-
-            if title in node_title.text:
-                return registration_card
+        return self.registration_cards.find_by_text(
+            title, exact=False, descendant='[data-test-node-title]'
+        )
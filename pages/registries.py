@@ -79,6 +79,9 @@ class BaseSubmittedRegistrationPage(GuidBasePage):
 class RegistrationDetailPage(BaseSubmittedRegistrationPage):
     """This is the Registration Overview Page"""
 
+    load_budget_ms = 5000
+    settled_budget_ms = 10000
+
     identity = Locator(
         By.CSS_SELECTOR, '[data-test-page-heading]', settings.LONG_TIMEOUT
     )
@@ -113,10 +116,7 @@ class RegistrationDetailPage(BaseSubmittedRegistrationPage):
     )
 
     def select_from_dropdown_listbox(self, selection):
-        for option in self.dropdown_options:
-            if option.text == selection:
-                option.click()
-                break
+        self.macro().select('dropdown_options', selection).run()
 
     preview_button = Locator(By.CSS_SELECTOR, '[data-test-preview-button]')
     resource_type_add_button = Locator(By.CSS_SELECTOR, '[data-test-add-button]')
@@ -178,10 +178,7 @@ class RegistrationMetadataPage(BaseSubmittedRegistrationPage):
     )
 
     def select_from_dropdown_listbox(self, selection):
-        for option in self.dropdown_options:
-            if option.text == selection:
-                option.click()
-                break
+        self.macro().select('dropdown_options', selection).run()
 
     resource_information_save_button = Locator(
         By.CSS_SELECTOR, '[data-test-save-resource-metadata-button]'
@@ -253,10 +250,7 @@ class RegistrationFileDetailPage(GuidBasePage):
     )
 
     def get_tag(self, tag_value):
-        for tag in self.tags:
-            if tag.text == tag_value:
-                return tag
-        return None
+        return self.tags.find_by_text(tag_value)
 
 
 class RegistrationResourcesPage(BaseSubmittedRegistrationPage):
@@ -365,10 +359,7 @@ class RegistrationAddNewPage(BaseRegistriesPage):
         return urljoin(self.base_url, self.provider_id) + '/' + self.url_addition
 
     def select_from_dropdown_listbox(self, selection):
-        for option in self.dropdown_options:
-            if option.text == selection:
-                option.click()
-                break
+        self.macro().select('dropdown_options', selection).run()
 
 
 class BaseRegistrationDraftPage(BaseRegistriesPage):
@@ -437,20 +428,16 @@ class DraftRegistrationMetadataPage(BaseRegistrationDraftPage):
     )
 
     def select_from_dropdown_listbox(self, selection):
-        for option in self.dropdown_options:
-            if option.text == selection:
-                option.click()
-                break
+        self.macro().select('dropdown_options', selection).run()
 
     def select_top_level_subject(self, selection):
-        for subject in self.top_level_subjects:
-            if subject.text == selection:
-                # Find the checkbox element and click it to select the subject
-                checkbox = subject.find_element_by_css_selector(
-                    'input.ember-checkbox.ember-view'
-                )
-                checkbox.click()
-                break
+        subject = self.top_level_subjects.find_by_text(selection)
+        if subject:
+            # Find the checkbox element and click it to select the subject
+            checkbox = subject.find_element_by_css_selector(
+                'input.ember-checkbox.ember-view'
+            )
+            checkbox.click()
 
 
 class DraftRegistrationSummaryPage(BaseRegistrationDraftPage):
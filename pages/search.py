@@ -11,6 +11,8 @@ from pages.base import OSFBasePage
 
 class SearchPage(OSFBasePage):
     url = settings.OSF_HOME + '/search/'
+    load_budget_ms = 5000
+    settled_budget_ms = 8000
 
     identity = Locator(By.CSS_SELECTOR, 'div[data-analytics-scope="Search page main"]')
     search_input = Locator(By.CSS_SELECTOR, 'input[data-test-search-input]')
@@ -136,12 +136,9 @@ class AccountSettingsPage(BaseUserSettingsPage):
     delete_aff_inst_modal = ComponentLocator(DeleteAffiliatedInstitutionModal)
 
     def get_unconfirmed_email_item(self, email_address):
-        for email_item in self.unconfirmed_emails:
-            email_addr = email_item.find_element_by_css_selector(
-                '._email-address_mkik0'
-            )
-            if email_address in email_addr.text:
-                return email_item
+        return self.unconfirmed_emails.find_by_text(
+            email_address, exact=False, descendant='._email-address_mkik0'
+        )
 
 
 class ConfigureAddonsPage(BaseUserSettingsPage):
@@ -168,12 +165,9 @@ class DeveloperAppsPage(BaseUserSettingsPage):
     delete_dev_app_modal = ComponentLocator(DeleteDevAppModal)
 
     def get_dev_app_card_by_app_name(self, app_name):
-        for dev_app_card in self.dev_app_cards:
-            dev_app_name = dev_app_card.find_element_by_css_selector(
-                '[data-analytics-name="App name"]'
-            )
-            if app_name in dev_app_name.text:
-                return dev_app_card
+        return self.dev_app_cards.find_by_text(
+            app_name, exact=False, descendant='[data-analytics-name="App name"]'
+        )
 
 
 class CreateDeveloperAppPage(BaseUserSettingsPage):
@@ -232,12 +226,9 @@ class PersonalAccessTokenPage(BaseUserSettingsPage):
     delete_pat_modal = ComponentLocator(DeletePATModal)
 
     def get_pat_card_by_name(self, pat_name):
-        for pat_card in self.pat_cards:
-            token_name = pat_card.find_element_by_css_selector(
-                '[data-analytics-name="Token name"]'
-            )
-            if pat_name in token_name.text:
-                return pat_card
+        return self.pat_cards.find_by_text(
+            pat_name, exact=False, descendant='[data-analytics-name="Token name"]'
+        )
 
 
 class CreatePersonalAccessTokenPage(BaseUserSettingsPage):
@@ -44,17 +44,85 @@ domains = {
 
 DRIVER = env('DRIVER', 'Firefox')
 HEADLESS = env.bool('HEADLESS', False)
+# Keep the browser open between test sessions run in the same process (e.g. retries),
+# resetting it instead of launching a new one
+REUSE_DRIVERS = env.bool('REUSE_DRIVERS', True)
+# Log users in again with the session cookie from their first login instead of CAS
+LOGIN_COOKIE_CACHE = env.bool('LOGIN_COOKIE_CACHE', True)
+# Directory to save the session cookie and local storage of each user switched to with
+# `use_persona` in, so that later runs can reuse them (kept in memory only if unset)
+PERSONA_DIR = env('PERSONA_DIR', None)
+# Launch Chrome or Firefox without images, web fonts, telemetry, prefetching and the like
+# (tests marked `full_browser` still get images and fonts, see utils.py)
+LEAN_BROWSER = env.bool('LEAN_BROWSER', False)
+# Block requests to analytics, tracking and web font hosts that pages don't need to work
+BLOCK_THIRD_PARTY = env.bool('BLOCK_THIRD_PARTY', False)
+THIRD_PARTY_BLOCKLIST = env.list(
+    'THIRD_PARTY_BLOCKLIST',
+    [
+        'www.google-analytics.com',
+        'ssl.google-analytics.com',
+        'www.googletagmanager.com',
+        'stats.g.doubleclick.net',
+        'static.hotjar.com',
+        'script.hotjar.com',
+        'js-agent.newrelic.com',
+        'bam.nr-data.net',
+        'fonts.googleapis.com',
+        'fonts.gstatic.com',
+        'use.typekit.net',
+    ],
+)
 
 QUICK_TIMEOUT = env.int('QUICK_TIMEOUT', 4)
 TIMEOUT = env.int('TIMEOUT', 10)
 LONG_TIMEOUT = env.int('LONG_TIMEOUT', 30)
 VERY_LONG_TIMEOUT = env.int('VERY_LONG_TIMEOUT', 60)
+# Short budgets for negative waits: how long `not_present` gives an element to go away
+# and how long `here_then_gone` gives an element to show up before waiting for it to go
+NEGATIVE_TIMEOUT = env.int('NEGATIVE_TIMEOUT', 2)
+APPEARANCE_TIMEOUT = env.int('APPEARANCE_TIMEOUT', 2)
+
+# Check presence, visibility and clickability of an element in one script per poll
+# instead of one WebDriverWait (and its own round trips) per check
+COMPOSITE_WAITS = env.bool('COMPOSITE_WAITS', True)
+# Reuse the WebElement a locator found last time while it is still on the same page
+CACHE_ELEMENTS = env.bool('CACHE_ELEMENTS', True)
+# Wait for elements with a MutationObserver in the page instead of polling from here
+EVENT_WAITS = env.bool('EVENT_WAITS', True)
+# Wait for the app to settle after navigating (in Chrome), then check the page without waiting
+WAIT_FOR_SETTLED = env.bool('WAIT_FOR_SETTLED', True)
+# How long `goto` waits for the app to settle before checking the page the usual way
+SETTLED_TIMEOUT = env.int('SETTLED_TIMEOUT', 3)
+# Navigate to Ember pages through the app already running in the browser, if there is one
+IN_APP_NAVIGATION = env.bool('IN_APP_NAVIGATION', False)
+# How many characters `send_keys_deliberately` types at a time
+TYPING_CHUNK_SIZE = env.int('TYPING_CHUNK_SIZE', 8)
+# Path of a JSON file to record how long every locator takes to resolve in (off if unset)
+LOCATOR_TIMINGS = env('LOCATOR_TIMINGS', None)
+# Path of a JSONL file to log the load timings of every page navigated to (off if unset)
+NAVIGATION_TIMINGS = env('NAVIGATION_TIMINGS', None)
+# Path of a JSON file of each page's load times over the last few runs, to compare each
+# run's against (off if unset), how many runs it keeps, and how many standard deviations
+# slower than them a page's median time has to be to be reported as a regression
+LATENCY_BASELINE = env('LATENCY_BASELINE', None)
+LATENCY_BASELINE_RUNS = env.int('LATENCY_BASELINE_RUNS', 20)
+LATENCY_REGRESSION_THRESHOLD = env.float('LATENCY_REGRESSION_THRESHOLD', 3.0)
+# Check pages against their `load_budget_ms` and `settled_budget_ms`
+LATENCY_BUDGETS = env.bool('LATENCY_BUDGETS', False)
+# Fail the run if a page goes over its latency budget or regresses against the baseline
+FAIL_ON_LATENCY_REGRESSION = env.bool('FAIL_ON_LATENCY_REGRESSION', False)
 
 DOMAIN = env('DOMAIN', 'stage1')
 
 NEW_USER_EMAIL = env('NEW_USER_EMAIL')
 
 
+# How many browser tabs `check_pages` loads pages in at once
+PAGE_CHECK_TABS = env.int('PAGE_CHECK_TABS', 4)
+# How many connections to each host the API helpers keep open for reuse
+API_POOL_SIZE = env.int('API_POOL_SIZE', 10)
+
 # Preferred node must be set to run tests on production
 PREFERRED_NODE = env('PREFERRED_NODE', None)
 # Initialize Popular Pages environment variable to None which is what it should be for
@@ -1,25 +1,72 @@
-import re
-
 import pytest
 from faker import Faker
-from pythosf import client
 
 import settings
 from api import osf_api
+from base.browser_state import browser_state
+from base.instrumentation import (
+    blocked_requests,
+    latency_budgets,
+    locator_timings,
+)
+from base.waits import negative_waits
 from pages.login import (
+    logged_in_as,
     logout,
     safe_login,
+    session_cookie_name,
 )
 from pages.project import ProjectPage
-from utils import launch_driver
+from utils import (
+    block_heavy_resources,
+    blocks_heavy_resources,
+    driver_pool,
+    launch_driver,
+    lean_drivers,
+)
+
+
+def pytest_sessionstart(session):
+    latency_budgets.reset()
+
+
+def pytest_sessionfinish(session):
+    if locator_timings.enabled:
+        locator_timings.write(settings.LOCATOR_TIMINGS)
+    latency_budgets.compare()
+    if (
+        settings.FAIL_ON_LATENCY_REGRESSION
+        and (latency_budgets.breaches or latency_budgets.regressions)
+        and session.exitstatus == 0
+    ):
+        session.exitstatus = 1  # As if a test had failed
+
+
+def pytest_terminal_summary(terminalreporter):
+    if negative_waits.count:
+        terminalreporter.write_sep('-', 'negative waits')
+        terminalreporter.write_line(negative_waits.summary())
+    if locator_timings.resolutions:
+        terminalreporter.write_sep('-', 'slowest locators')
+        for line in locator_timings.table():
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(
+            'Full timings written to {}'.format(settings.LOCATOR_TIMINGS)
+        )
+    if blocked_requests.pages:
+        terminalreporter.write_sep('-', 'blocked third-party requests')
+        for line in blocked_requests.table():
+            terminalreporter.write_line(line)
+    latency_report = latency_budgets.report()
+    if latency_report:
+        terminalreporter.write_sep('-', 'latency budgets and regressions')
+        for line in latency_report:
+            terminalreporter.write_line(line)
 
 
 @pytest.fixture(scope='session')
 def session():
-    return client.Session(
-        api_base_url=settings.API_DOMAIN,
-        auth=(settings.USER_ONE, settings.USER_ONE_PASSWORD),
-    )
+    return osf_api.get_default_session()
 
 
 @pytest.fixture(scope='session', autouse=True)
@@ -33,9 +80,35 @@ def check_credentials(session):
 
 @pytest.fixture(scope='session')
 def driver():
-    driver = launch_driver()
+    if not settings.REUSE_DRIVERS:
+        driver = launch_driver()
+        yield driver
+        driver.quit()
+        return
+    driver = driver_pool.acquire()
     yield driver
-    driver.quit()
+    driver_pool.release(driver)
+
+
+@pytest.fixture(autouse=True)
+def browser_profile(request, driver):
+    """Load images and fonts or not, as the test's `lean_browser` or `full_browser`
+    marker and LEAN_BROWSER call for (see `block_heavy_resources`). A test that needs
+    them is only skipped in a lean browser that can't load them again.
+    """
+    full = request.node.get_closest_marker('full_browser') is not None
+    lean = not full and (
+        settings.LEAN_BROWSER
+        or request.node.get_closest_marker('lean_browser') is not None
+    )
+    if not lean and not blocks_heavy_resources(driver):
+        # Already loading them, as a browser does unless told otherwise
+        return
+    if not block_heavy_resources(driver, lean) and full and driver in lean_drivers:
+        pytest.skip(
+            'Needs images and fonts, which this lean browser cannot load again '
+            '(run it with LEAN_BROWSER=False)'
+        )
 
 
 @pytest.fixture(scope='session')
@@ -54,8 +127,12 @@ def hide_cookie_banner(driver):
     (as it can obscure other UI elements).
      Note: If we ever want to test that banner will need to stop this cookie from being set.
     """
+    state = browser_state(driver)
+    if 'cookie_banner_hidden' in state.flags:
+        return
     driver.get(settings.OSF_HOME)
     driver.add_cookie({'name': 'osf_cookieconsent', 'value': '1', 'domain': '.osf.io'})
+    state.flags.add('cookie_banner_hidden')
 
 
 @pytest.fixture(scope='session')
@@ -65,11 +142,33 @@ def hide_footer_slide_in(driver):
     in. The slide in heading is: 'Start managing your projects on the OSF today.').
     This slide in can obscure other elements.
     """
+    state = browser_state(driver)
+    if 'footer_slide_in_hidden' in state.flags:
+        return
     driver.execute_script('window.localStorage.setItem("slide", 0);')
+    state.flags.add('footer_slide_in_hidden')
+
+
+# The user each class-scoped login fixture logs in as
+login_fixture_users = {
+    'must_be_logged_in': settings.USER_ONE,
+    'must_be_logged_in_as_user_two': settings.USER_TWO,
+    'must_be_logged_in_as_registration_user': settings.REGISTRATIONS_USER,
+}
 
 
 @pytest.fixture(scope='class', autouse=True)
-def default_logout(driver):
+def default_logout(request, driver):
+    """Log out before each test class, unless the class is about to log in as the user
+    who is already logged in.
+    """
+    users = {
+        login_fixture_users[name]
+        for name in request.fixturenames
+        if name in login_fixture_users
+    }
+    if len(users) == 1 and logged_in_as(driver, users.pop()):
+        return
     logout(driver)
 
 
@@ -95,15 +194,7 @@ def user_logged_in(driver):
     existence of the OSF session cookie.  If the cookie exists then return True
     indicating that the user is logged in, otherwise return False.
     """
-    if settings.PRODUCTION:
-        cookie_name = 'osf'
-    else:
-        # In the testing environments the cookie name contains the environment (i.e.
-        # 'osf_test').  So parse out the environment from the OSF_HOME url.
-        match = re.search(r'(.*)\.osf\.io', settings.OSF_HOME[8:])
-        cookie_name = 'osf_' + match.group(1)
-
-    logged_in_cookie = driver.get_cookie(cookie_name)
+    logged_in_cookie = driver.get_cookie(session_cookie_name())
     if logged_in_cookie:
         return True
     else:
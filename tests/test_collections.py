@@ -5,7 +5,6 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
 import markers
-import settings
 from api import osf_api
 from pages.collections import (
     CollectionDiscoverPage,
@@ -18,7 +17,7 @@ from pages.collections import (
 )
 from pages.login import (
     logout,
-    safe_login,
+    use_persona,
 )
 from pages.project import ProjectPage
 
@@ -46,7 +45,7 @@ class TestCollectionDiscoverPages:
     def test_discover_page(self, session, driver, provider):
         discover_page = CollectionDiscoverPage(driver, provider=provider)
         discover_page.goto()
-        discover_page.loading_indicator.here_then_gone()
+        assert discover_page.wait_until_settled()
         assert CollectionDiscoverPage(driver, verify=True)
 
 
@@ -210,7 +209,7 @@ class TestCollectionModeration:
         )
         pending_page.goto()
         assert CollectionModerationPendingPage(driver, verify=True)
-        pending_page.loading_indicator.here_then_gone()
+        assert pending_page.wait_until_settled()
 
         # Get the card for the project that was just submitted to the collection
         submission_card = pending_page.get_submission_card(collection_project.id)
@@ -223,7 +222,7 @@ class TestCollectionModeration:
 
         # On the Moderation Dropdown, click the Accept Request radio button and enter a
         # comment and then click the Submit button
-        pending_page.loading_indicator.here_then_gone()
+        assert pending_page.wait_until_settled()
         pending_page.accept_radio_button.click()
         pending_page.moderation_comment.click()
         pending_page.moderation_comment.send_keys_deliberately(
@@ -231,7 +230,7 @@ class TestCollectionModeration:
         )
         pending_page.scroll_into_view(pending_page.submit_button.element)
         pending_page.submit_button.click()
-        pending_page.loading_indicator.here_then_gone()
+        assert pending_page.wait_until_settled()
 
         # Navigate to the Accepted Page
         accepted_page = CollectionModerationAcceptedPage(
@@ -239,7 +238,7 @@ class TestCollectionModeration:
         )
         accepted_page.goto()
         assert CollectionModerationAcceptedPage(driver, verify=True)
-        accepted_page.loading_indicator.here_then_gone()
+        assert accepted_page.wait_until_settled()
 
         # Find the card for the project that was just accepted and click the link for
         # this project to go to the Project Overview Page. It should be the first one
@@ -289,7 +288,7 @@ class TestCollectionModeration:
             )
             pending_page.goto()
             assert CollectionModerationPendingPage(driver, verify=True)
-            pending_page.loading_indicator.here_then_gone()
+            assert pending_page.wait_until_settled()
 
             # Get the card for the project that was just submitted to the collection
             submission_card = pending_page.get_submission_card(collection_project.id)
@@ -302,7 +301,7 @@ class TestCollectionModeration:
 
             # On the Moderation Dropdown, click the Reject Request radio button and
             # enter a comment and then click the Submit button
-            pending_page.loading_indicator.here_then_gone()
+            assert pending_page.wait_until_settled()
             pending_page.reject_radio_button.click()
             pending_page.moderation_comment.click()
             pending_page.moderation_comment.send_keys_deliberately(
@@ -310,7 +309,7 @@ class TestCollectionModeration:
             )
             pending_page.scroll_into_view(pending_page.submit_button.element)
             pending_page.submit_button.click()
-            pending_page.loading_indicator.here_then_gone()
+            assert pending_page.wait_until_settled()
 
             # Navigate to the Rejected Page
             rejected_page = CollectionModerationRejectedPage(
@@ -318,7 +317,7 @@ class TestCollectionModeration:
             )
             rejected_page.goto()
             assert CollectionModerationRejectedPage(driver, verify=True)
-            rejected_page.loading_indicator.here_then_gone()
+            assert rejected_page.wait_until_settled()
 
             # Find the card for the project that was just rejected and click the link
             # for this project to go to the Project Overview Page. It should be the
@@ -340,11 +339,8 @@ class TestCollectionModeration:
             project_page = ProjectPage(driver, verify=True)
             assert project_page.collections_container.absent()
 
-            # Logout and then login as User Two
-            logout(driver)
-            safe_login(
-                driver, user=settings.USER_TWO, password=settings.USER_TWO_PASSWORD
-            )
+            # Switch to User Two
+            use_persona(driver, 'user_two')
 
             # Navigate to the Project Overview page for the project that was just
             # rejected from the collection and verify that the user that created and
@@ -399,7 +395,7 @@ class TestCollectionModeration:
             )
             accepted_page.goto()
             assert CollectionModerationAcceptedPage(driver, verify=True)
-            accepted_page.loading_indicator.here_then_gone()
+            assert accepted_page.wait_until_settled()
 
             # Get the card for the project that was just submitted to the collection
             submission_card = accepted_page.get_submission_card(collection_project.id)
@@ -412,7 +408,7 @@ class TestCollectionModeration:
 
             # On the Moderation Dropdown, click the Remove Item radio button and enter a
             # comment and then click the Submit button
-            accepted_page.loading_indicator.here_then_gone()
+            assert accepted_page.wait_until_settled()
             accepted_page.remove_radio_button.click()
             accepted_page.moderation_comment.click()
             accepted_page.moderation_comment.send_keys_deliberately(
@@ -420,7 +416,7 @@ class TestCollectionModeration:
             )
             accepted_page.scroll_into_view(accepted_page.submit_button.element)
             accepted_page.submit_button.click()
-            accepted_page.loading_indicator.here_then_gone()
+            assert accepted_page.wait_until_settled()
 
             # Navigate to the Removed Page
             removed_page = CollectionModerationRemovedPage(
@@ -428,7 +424,7 @@ class TestCollectionModeration:
             )
             removed_page.goto()
             assert CollectionModerationRemovedPage(driver, verify=True)
-            removed_page.loading_indicator.here_then_gone()
+            assert removed_page.wait_until_settled()
 
             # Find the card for the project that was just removed and click the link
             # for this project to go to the Project Overview Page. It should be the
@@ -450,11 +446,8 @@ class TestCollectionModeration:
             project_page = ProjectPage(driver, verify=True)
             assert project_page.collections_container.absent()
 
-            # Logout and then login as User Two
-            logout(driver)
-            safe_login(
-                driver, user=settings.USER_TWO, password=settings.USER_TWO_PASSWORD
-            )
+            # Switch to User Two
+            use_persona(driver, 'user_two')
 
             # Navigate to the Project Overview page for the project that was just
             # removed from the collection and verify that the user that created and
@@ -550,9 +543,8 @@ class TestCollectionModeration:
                 == 'Project admin removing project from collection via selenium automated test.'
             )
 
-            # Logout and then login as User One who is the collection moderator
-            logout(driver)
-            safe_login(driver)
+            # Switch to User One who is the collection moderator
+            use_persona(driver, 'user_one')
 
             # Navigate to the Collection Moderation Removed Page
             removed_page = CollectionModerationRemovedPage(
@@ -560,7 +552,7 @@ class TestCollectionModeration:
             )
             removed_page.goto()
             assert CollectionModerationRemovedPage(driver, verify=True)
-            removed_page.loading_indicator.here_then_gone()
+            assert removed_page.wait_until_settled()
 
             # Find the card for the project that was just removed and click the link for
             # this project to go to the Project Overview Page. It should be the first one
@@ -4,6 +4,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
 import markers
+import settings
 from api import osf_api
 from pages.institutions import (
     InstitutionAdminDashboardPage,
@@ -44,11 +45,10 @@ class TestInstitutionAdminDashboardPage:
         dashboard_page = InstitutionAdminDashboardPage(driver, institution_id='cos')
         dashboard_page.goto()
         assert InstitutionAdminDashboardPage(driver, verify=True)
-        dashboard_page.loading_indicator.here_then_gone()
+        assert dashboard_page.wait_until_settled(settings.LONG_TIMEOUT)
 
         # Select 'QA' from Departments listbox and verify that the correct number
         # of users are displayed in the table
-        dashboard_page.departments_listbox_trigger.click()
         dashboard_page.select_department_from_listbox('QA')
         WebDriverWait(driver, 10).until(
             EC.visibility_of_element_located((By.CSS_SELECTOR, '[data-test-item-name]'))
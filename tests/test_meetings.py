@@ -21,8 +21,9 @@ def meetings_page(driver):
 @markers.smoke_test
 @markers.core_functionality
 class TestMeetingsPage:
+    @markers.full_browser
     def test_meetings_landing(self, meetings_page, driver):
-        assert meetings_page.register_text.absent()
+        assert meetings_page.register_text.not_present()
         # Need to scroll down since the Register button is obscured by the Dev mode warning in staging environments
         # Targeting the text about the conference minimum to scroll to since it is under the Register button and so
         # the scroll should put the Register button in the middle of the page.
@@ -33,7 +34,7 @@ class TestMeetingsPage:
         meetings_page.register_button.click()
         assert meetings_page.register_text.present()
 
-        assert meetings_page.upload_text.absent()
+        assert meetings_page.upload_text.not_present()
         meetings_page.upload_button.click()
         assert meetings_page.upload_text.present()
 
@@ -51,7 +52,7 @@ class TestMeetingsPage:
         meetings_page.filter_input.clear()
         meetings_page.filter_input.send_keys('z')
         meetings_page = MeetingsPage(driver, verify=True)
-        meetings_page.skeleton_row.here_then_gone()
+        assert meetings_page.wait_until_settled()
 
         filtered_top_result = meetings_page.top_meeting_link.text
         assert default_top_result != filtered_top_result
@@ -263,6 +263,7 @@ class TestFilesMetadata:
         """This test verifies download functionality for file metadata."""
 
         try:
+            before = utils.download_snapshot(driver)
             WebDriverWait(driver, 5).until(
                 EC.element_to_be_clickable(
                     (By.CSS_SELECTOR, '[data-test-download-button]')
@@ -281,8 +282,9 @@ class TestFilesMetadata:
                         '[data-test-download-button]'
                     ).get_attribute('href')
                     guid = utils.get_guid_from_url(url, 3)
-                    filename = utils.latest_download_file()
-                    assert guid in filename
+                    assert utils.wait_for_download(
+                        driver, lambda file_name: guid in file_name, before=before
+                    )
                 else:
                     utils.verify_file_download(driver, file_name='')
 
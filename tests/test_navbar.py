@@ -85,7 +85,7 @@ class NavbarTestLoggedOutMixin:
         RegisterPage(driver, verify=True)
 
     def test_user_dropdown_not_present(self, page):
-        assert page.navbar.user_dropdown.absent()
+        assert page.navbar.user_dropdown.not_present()
 
 
 class NavbarTestLoggedInMixin:
@@ -111,10 +111,10 @@ class NavbarTestLoggedInMixin:
         assert ProfileInformationPage(driver, verify=True)
 
     def test_sign_in_button_not_present(self, page):
-        assert page.navbar.sign_in_button.absent()
+        assert page.navbar.sign_in_button.not_present()
 
     def test_sign_up_button_not_present(self, page):
-        assert page.navbar.sign_up_button.absent()
+        assert page.navbar.sign_up_button.not_present()
 
     def test_logout_link(self, driver, page):
         page.navbar.user_dropdown.click()
@@ -132,7 +132,7 @@ class TestOSFHomeNavbarLoggedOut(NavbarTestLoggedOutMixin):
         return page
 
     def test_my_projects_link_not_present(self, page):
-        assert page.navbar.my_projects_link.absent()
+        assert page.navbar.my_projects_link.not_present()
 
     def test_search_link(self, driver, page):
         page.navbar.search_link.click()
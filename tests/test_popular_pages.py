@@ -2,12 +2,19 @@ import pytest
 
 import markers
 import settings
-from base.exceptions import PageException
+from base.availability import check_pages
 from pages.preprints import PreprintDetailPage
 from pages.project import ProjectPage
 from pages.registries import RegistrationDetailPage
 
 
+page_classes = {
+    'project': ProjectPage,
+    'preprint': PreprintDetailPage,
+    'registration': RegistrationDetailPage,
+}
+
+
 @pytest.mark.skipif(
     not settings.PRODUCTION,
     reason='This test is only for the Two Minute Drill in Production',
@@ -19,35 +26,33 @@ class TestPopularPages:
         The list of pages are contained in the environment variable POPULAR_PAGES.
         Each page in the list should begin with the OSF object type (project, preprint,
         or registration) followed by a : and then the guid of the object. EX: 'project:abcde'.
-        The test will process every list item and attempt to load every page before any
-        error is thrown.  After the entire list has been processed, if there were any
-        errors the test will fail and display a list of all of the pages that failed
-        to load.
+        The pages are loaded several at a time in separate tabs (see `check_pages`), and
+        every page is attempted before any error is thrown.  After the entire list has
+        been processed, if there were any errors the test will fail and display a list
+        of all of the pages that failed to load.
         """
         popular_pages = settings.POPULAR_PAGES
 
         failed_list = []
+        pages = []
         for page in popular_pages:
             segments = page.split(':')
             page_type = segments[0]
             guid = segments[1]
 
             # Set page class type
-            if page_type == 'project':
-                page_class = ProjectPage(driver, guid=guid)
-            elif page_type == 'preprint':
-                page_class = PreprintDetailPage(driver, guid=guid)
-            elif page_type == 'registration':
-                page_class = RegistrationDetailPage(driver, guid=guid)
+            if page_type in page_classes:
+                pages.append((page, page_classes[page_type](driver, guid=guid)))
             else:
                 # Not one of the valid object types so add to the error list
                 failed_list.append('Not a valid object type - ' + page)
 
-            try:
-                page_class.goto()
-                assert page_class.verify()
-            except PageException:
-                failed_list.append(page)
+        checks = check_pages(driver, [page_object for _, page_object in pages])
+        for (page, _), check in zip(pages, checks):
+            if not check.loaded:
+                failed_list.append(
+                    '{} ({} after {:.1f}s)'.format(page, check.error, check.seconds)
+                )
 
         # If there were any page load failures then fail the test and print the lines
         # that failed
@@ -27,7 +27,7 @@ class TestAnalyticsPage:
         """
         analytics_page = AnalyticsPage(driver, guid=default_project.id)
         analytics_page.goto()
-        analytics_page.loading_indicator.here_then_gone()
+        assert analytics_page.wait_until_settled()
         assert analytics_page.private_project_message.present()
         # Existing bug - ENG-4456 - Graphs on Private Projects should be Disabled
         # assert analytics_page.disabled_chart.present()
@@ -141,7 +141,7 @@ class TestNodeAnalytics:
         # Next navigate to the Analytics page for the project.
         analytics_page = AnalyticsPage(driver, guid=public_project_node)
         analytics_page.goto_with_reload()
-        analytics_page.loading_indicator.here_then_gone()
+        assert analytics_page.wait_until_settled()
 
         analytics_page.scroll_into_view(
             analytics_page.unique_visits_week_current_day_point.element
@@ -197,7 +197,7 @@ class TestNodeAnalytics:
         )
         driver.get(url)
         analytics_page = AnalyticsPage(driver, verify=True)
-        analytics_page.loading_indicator.here_then_gone()
+        assert analytics_page.wait_until_settled()
 
         # Hover the mouse over the bar on the Time of Day of Visits graph that
         # represents the current hour of the day and get the value that is displayed
@@ -243,7 +243,7 @@ class TestNodeAnalytics:
         )
         driver.get(url)
         analytics_page = AnalyticsPage(driver, verify=True)
-        analytics_page.loading_indicator.here_then_gone()
+        assert analytics_page.wait_until_settled()
 
         # Scroll down and get the label for the most popular page (top bar) from the
         # Popular Pages graph
@@ -16,7 +16,12 @@ from pages.project import (
     FilesPage,
     verify_log_entry,
 )
-from utils import find_current_browser
+from utils import (
+    download_dir,
+    download_snapshot,
+    find_current_browser,
+    wait_for_download,
+)
 
 
 """
@@ -30,11 +35,7 @@ testable_addons = ['box', 'dropbox', 's3']
 
 
 def find_row_by_name(files_page, file_name):
-    all_files = files_page.file_rows
-    for file_row in all_files:
-        if file_name in file_row.text:
-            return file_row
-    return
+    return files_page.file_rows.find_by_text(file_name, exact=False)
 
 
 def connect_addon_to_node(session, provider, node_id):
@@ -52,10 +53,10 @@ def verify_file_download(driver, files_page, file_name):
     """
 
     # If running on local machine, first check if the download file already exists
-    # in the Downloads folder. If so then delete the old copy before attempting to
-    # download a new one.
+    # in the driver's download folder. If so then delete the old copy before attempting
+    # to download a new one.
     if settings.DRIVER != 'Remote':
-        file_path = os.path.expanduser('~/Downloads/' + file_name)
+        file_path = os.path.join(download_dir(driver), file_name)
         if os.path.exists(file_path):
             os.remove(file_path)
 
@@ -68,18 +69,18 @@ def verify_file_download(driver, files_page, file_name):
     )
     menu_button.click()
     download_button = row.find_element_by_css_selector('[data-test-download-button]')
+    before = download_snapshot(driver)
     download_button.click()
 
-    # Reload the page to allow time for the download to complete
-    files_page.reload()
-    WebDriverWait(driver, 5).until(
-        EC.visibility_of_element_located(
-            (By.CSS_SELECTOR, '[data-test-file-list-item]')
-        )
-    )
-
     current_date = datetime.datetime.now()
     if settings.DRIVER == 'Remote':
+        # Reload the page to allow time for the download to complete
+        files_page.reload()
+        WebDriverWait(driver, 5).until(
+            EC.visibility_of_element_located(
+                (By.CSS_SELECTOR, '[data-test-file-list-item]')
+            )
+        )
         # First verify the downloaded file exists on the virtual remote machine
         assert driver.execute_script(
             'browserstack_executor: {"action": "fileExists", "arguments": {"fileName": "%s"}}'
@@ -93,9 +94,9 @@ def verify_file_download(driver, files_page, file_name):
         file_create_date = datetime.datetime.fromtimestamp(file_props['created_time'])
         assert file_create_date.date() == current_date.date()
     else:
-        # First verify the downloaded file exists
-        file_path = os.path.expanduser('~/Downloads/' + file_name)
-        assert os.path.exists(file_path)
+        # First verify the file finishes downloading
+        file_path = wait_for_download(driver, file_name, before=before)
+        assert file_path is not None
         # Next verify the file was downloaded today
         file_mtime = os.path.getmtime(file_path)
         file_mod_date = datetime.datetime.fromtimestamp(file_mtime)
@@ -224,7 +225,15 @@ class TestFilesPage:
             delete_button.click()
             # Click the Delete button on the modal
             files_page.delete_modal.delete_button[0].click()
-            files_page.loading_indicator.here_then_gone()
+            # Wait for the file to be deleted and the files list to reload
+            deletion = files_page.wait_for_request(
+                '/providers/' + provider, method='DELETE'
+            )
+            assert deletion is not None, 'No DELETE request was made for the file'
+            assert (
+                200 <= deletion['status'] < 300
+            ), 'Deleting the file failed: {}'.format(deletion)
+            files_page.wait_for_network_idle()
             # Verify file has been deleted from the files list
             deleted_row = find_row_by_name(files_page, new_file)
             assert deleted_row is None
@@ -294,7 +303,7 @@ class TestFilesPage:
                 files_page.delete_modal.heading.text == '2 items deleted successfully'
             )
             files_page.delete_modal.done_button.click()
-            files_page.loading_indicator.here_then_gone()
+            files_page.wait_for_network_idle()
             # Verify both files have been deleted from the files list
             deleted_row_1 = find_row_by_name(files_page, new_file_1)
             assert deleted_row_1 is None
@@ -416,10 +425,7 @@ class TestFilesPage:
             # Click the Project link on the Move modal to go up a level and then click
             # the OSF Storage link. Then click the Move button on the modal to move
             # the file to OSF Storage.
-            files_page.move_copy_modal.project_link.click()
-            files_page.move_copy_modal.provider_osfstorage_link.click()
-            files_page.move_copy_modal.loading_indicator.here_then_gone()
-            files_page.move_copy_modal.move_copy_button.click()
+            files_page.move_copy_modal.move_copy_to_osfstorage()
             # After the move process has finished click the Done button to go back to
             # the Files list page.
             WebDriverWait(driver, 90).until(
@@ -559,10 +565,7 @@ class TestFilesPage:
             # Click the Project link on the Copy modal to go up a level and then click
             # the OSF Storage link. Then click the Copy button on the modal to copy
             # the file to OSF Storage.
-            files_page.move_copy_modal.project_link.click()
-            files_page.move_copy_modal.provider_osfstorage_link.click()
-            files_page.move_copy_modal.loading_indicator.here_then_gone()
-            files_page.move_copy_modal.move_copy_button.click()
+            files_page.move_copy_modal.move_copy_to_osfstorage()
             # After the copy process has finished click the Done button to go back to
             # the Files list page.
             WebDriverWait(driver, 90).until(
@@ -4,7 +4,6 @@ import re
 import tkinter
 
 import pytest
-from pythosf import client
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
@@ -34,7 +33,12 @@ from pages.registries import (
     RegistriesLandingPage,
 )
 from pages.search import SearchPage
-from utils import find_current_browser
+from utils import (
+    download_dir,
+    download_snapshot,
+    find_current_browser,
+    wait_for_download,
+)
 
 
 @pytest.fixture
@@ -190,7 +194,7 @@ class TestDraftRegistration:
         metadata_page.scroll_into_view(metadata_page.tags_input_box.element)
 
         # Create a list of the top level subject names as they are displayed on the page
-        subject_list = [subject.text for subject in metadata_page.top_level_subjects]
+        subject_list = metadata_page.top_level_subjects.texts()
 
         # Create a sorted copy of the subject list
         sorted_subjects = sorted(subject_list.copy())
@@ -206,10 +210,7 @@ class TestDraftRegistration:
         # Create a list of the expanded second level subject names and a sorted copy
         # of the list and verify that the second level subject list is also sorted
         # correctly.
-        sec_subject_list = [
-            subject.text
-            for subject in metadata_page.first_subject_second_level_subjects
-        ]
+        sec_subject_list = metadata_page.first_subject_second_level_subjects.texts()
         sec_sorted_subjects = sorted(sec_subject_list.copy())
         assert sec_sorted_subjects == sec_subject_list
 
@@ -228,10 +229,7 @@ def login_as_user_with_registrations(driver):
 class TestRegistrationSubmission:
     @pytest.fixture
     def registration_user_session(self):
-        return client.Session(
-            api_base_url=settings.API_DOMAIN,
-            auth=(settings.REGISTRATIONS_USER, settings.REGISTRATIONS_USER_PASSWORD),
-        )
+        return osf_api.get_registrations_user_session()
 
     @pytest.fixture
     def project_with_file_reg(self, registration_user_session):
@@ -749,26 +747,26 @@ class TestRegistrationFilesPages:
         """
 
         # If running on local machine, first check if the file already exists in the
-        # Downloads folder. If so then delete the old copy before attempting to download
-        # a new one.
+        # driver's download folder. If so then delete the old copy before attempting to
+        # download a new one.
         if settings.DRIVER != 'Remote':
-            file_path = os.path.expanduser('~/Downloads/' + file_name)
+            file_path = os.path.join(download_dir(driver), file_name)
             if os.path.exists(file_path):
                 os.remove(file_path)
 
         # Click Download link from File Options menu
+        before = download_snapshot(driver)
         page.download_link.click()
 
-        # The actual file download usually takes a second or two, so we will just
-        # reload the page.
-        page.reload()
-        WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, wait_selector))
-        )
-
         # Verify that the file is actually downloaded to user's machine
         current_date = datetime.datetime.now()
         if settings.DRIVER == 'Remote':
+            # The actual file download usually takes a second or two, so we will just
+            # reload the page.
+            page.reload()
+            WebDriverWait(driver, 10).until(
+                EC.visibility_of_element_located((By.CSS_SELECTOR, wait_selector))
+            )
             # First verify the downloaded file exists on the virtual remote machine
             assert driver.execute_script(
                 'browserstack_executor: {"action": "fileExists", "arguments": {"fileName": "%s"}}'
@@ -785,8 +783,9 @@ class TestRegistrationFilesPages:
             )
             assert file_create_date.date() == current_date.date()
         else:
-            # First verify the downloaded file exists
-            assert os.path.exists(file_path)
+            # First verify the file finishes downloading
+            file_path = wait_for_download(driver, file_name, before=before)
+            assert file_path is not None
             # Next verify the file was downloaded today
             file_mtime = os.path.getmtime(file_path)
             file_mod_date = datetime.datetime.fromtimestamp(file_mtime)
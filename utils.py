@@ -1,16 +1,242 @@
+import atexit
+import ctypes
+import ctypes.util
 import datetime
+import hashlib
 import os
+import select
+import shutil
+import tempfile
+import time
+import weakref
 
 from selenium import webdriver
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
 
 import settings
+from base import scripts
+from base.browser_state import forget_state
+from base.instrumentation import blocked_requests
+
+
+# Drivers launched with a lean profile
+lean_drivers = weakref.WeakSet()
+# The url patterns each (Chrome) driver is currently blocking
+blocked_urls = weakref.WeakKeyDictionary()
+# Whether each (local Firefox) driver currently blocks images and fonts
+firefox_heavy_resources = weakref.WeakKeyDictionary()
+# Drivers that can't block images and fonts, so that it isn't tried again for each test
+heavy_resources_unsupported = weakref.WeakKeyDictionary()
+# The directory each (local Chrome or Firefox) driver downloads files to
+download_dirs = weakref.WeakKeyDictionary()
+
+# What a lean browser turns off: telemetry, safe browsing lookups, prefetching,
+# extension and component updates, smooth scrolling, autoplaying media, and images and
+# web fonts. Images and fonts are blocked with `block_heavy_resources`, so that they can
+# be turned back on for a test that needs them (in Firefox they start off blocked too).
+LEAN_CHROME_ARGUMENTS = [
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-extensions',
+    '--disable-sync',
+    '--disable-smooth-scrolling',
+    '--metrics-recording-only',
+    '--no-pings',
+    '--safebrowsing-disable-auto-update',
+    '--autoplay-policy=user-gesture-required',
+]
+LEAN_CHROME_PREFS = {
+    'net.network_prediction_options': 2,
+    'safebrowsing.enabled': False,
+}
+LEAN_FIREFOX_PREFS = {
+    'permissions.default.image': 2,
+    'gfx.downloadable_fonts.enabled': False,
+    'media.autoplay.default': 5,
+    'general.smoothScroll': False,
+    'network.prefetch-next': False,
+    'network.dns.disablePrefetch': True,
+    'network.predictor.enabled': False,
+    'network.http.speculative-parallel-limit': 0,
+    'toolkit.telemetry.enabled': False,
+    'datareporting.healthreport.uploadEnabled': False,
+    'datareporting.policy.dataSubmissionEnabled': False,
+    'app.shield.optoutstudies.enabled': False,
+    'browser.safebrowsing.malware.enabled': False,
+    'browser.safebrowsing.phishing.enabled': False,
+    'browser.safebrowsing.downloads.enabled': False,
+    'browser.safebrowsing.blockedURIs.enabled': False,
+    'extensions.update.enabled': False,
+    'app.update.auto': False,
+}
+# The Firefox preferences that block images and fonts, and the ones that don't
+FIREFOX_HEAVY_RESOURCE_PREFS = {
+    True: {'permissions.default.image': 2, 'gfx.downloadable_fonts.enabled': False},
+    False: {'permissions.default.image': 1, 'gfx.downloadable_fonts.enabled': True},
+}
+# Urls of the images and fonts `block_urls` blocks
+HEAVY_RESOURCE_PATTERNS = [
+    '*.png',
+    '*.jpg',
+    '*.jpeg',
+    '*.gif',
+    '*.svg',
+    '*.webp',
+    '*.ico',
+    '*.woff',
+    '*.woff2',
+    '*.ttf',
+    '*.otf',
+]
+
+
+def use_lean_chrome_options(chrome_options):
+    for argument in LEAN_CHROME_ARGUMENTS:
+        chrome_options.add_argument(argument)
+    preferences = chrome_options.experimental_options.get('prefs', {})
+    preferences.update(LEAN_CHROME_PREFS)
+    chrome_options.add_experimental_option('prefs', preferences)
+    # Don't wait for images, stylesheets and subframes to load
+    chrome_options.set_capability('pageLoadStrategy', 'eager')
+
+
+def use_lean_firefox_options(ffo):
+    for name, value in LEAN_FIREFOX_PREFS.items():
+        ffo.set_preference(name, value)
+    ffo.set_capability('pageLoadStrategy', 'eager')
+
+
+def block_third_party_firefox(ffo):
+    """Make Firefox resolve the hosts in THIRD_PARTY_BLOCKLIST to this machine, where
+    requests to them fail straight away.
+    """
+    ffo.set_preference(
+        'network.dns.localDomains', ','.join(settings.THIRD_PARTY_BLOCKLIST)
+    )
+
+
+def set_firefox_prefs(driver, preferences):
+    """Change preferences of a running Firefox (see `scripts.SET_FIREFOX_PREFS`).
+
+    :return: True if done, False if the driver can't (i.e. isn't local Firefox).
+    """
+    try:
+        with driver.context(driver.CONTEXT_CHROME):
+            driver.execute_script(scripts.SET_FIREFOX_PREFS, preferences)
+    except (AttributeError, WebDriverException):
+        return False
+    return True
+
+
+def block_heavy_resources(driver, block):
+    """Block images and fonts in Chrome (with `block_urls`) or Firefox (with
+    `set_firefox_prefs`) if `block`, otherwise let them load.
+
+    :return: True if done, False if the driver can't.
+    """
+    if driver in heavy_resources_unsupported:
+        return False
+    if block_urls(driver, heavy_resources=block):
+        return True
+    if firefox_heavy_resources.get(driver) == block:
+        return True
+    if not set_firefox_prefs(driver, FIREFOX_HEAVY_RESOURCE_PREFS[block]):
+        heavy_resources_unsupported[driver] = True
+        return False
+    firefox_heavy_resources[driver] = block
+    return True
+
+
+def blocks_heavy_resources(driver):
+    """Whether the driver currently blocks images and fonts (see
+    `block_heavy_resources`).
+    """
+    patterns = blocked_urls.get(driver) or []
+    return firefox_heavy_resources.get(driver, False) or any(
+        pattern in patterns for pattern in HEAVY_RESOURCE_PATTERNS
+    )
+
+
+def block_urls(driver, heavy_resources=False):
+    """Set what Chrome blocks: requests to the hosts in THIRD_PARTY_BLOCKLIST if
+    BLOCK_THIRD_PARTY is on (counting the driver in `blocked_requests.drivers`), and
+    images and fonts if `heavy_resources`.
+
+    :return: True if done, False if the driver can't (i.e. isn't local Chrome).
+    """
+    patterns = []
+    if settings.BLOCK_THIRD_PARTY:
+        patterns.extend(
+            '*://{}/*'.format(host) for host in settings.THIRD_PARTY_BLOCKLIST
+        )
+    if heavy_resources:
+        patterns.extend(HEAVY_RESOURCE_PATTERNS)
+    if blocked_urls.get(driver) == patterns:
+        return True
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    except (AttributeError, WebDriverException):
+        return False
+    blocked_urls[driver] = patterns
+    if settings.BLOCK_THIRD_PARTY:
+        blocked_requests.drivers.add(driver)
+    return True
+
+
+def firefox_options(directory, lean=False):
+    """Options for a local Firefox, headless if `settings.HEADLESS`, that downloads
+    files to `directory` without asking.
+    """
+    from selenium.webdriver.firefox.options import Options
+
+    ffo = Options()
+    ffo.headless = settings.HEADLESS
+    # Set the default download location [0=Desktop, 1=Downloads, 2=Specified location]
+    ffo.set_preference('browser.download.folderList', 2)
+    ffo.set_preference('browser.download.dir', directory)
+    ffo.set_preference('browser.download.manager.showWhenStarting', False)
+    ffo.set_preference('browser.helperApps.alwaysAsk.force', False)
+    ffo.set_preference(
+        'browser.helperApps.neverAsk.saveToDisk',
+        'text/plain, application/octet-stream, application/binary, text/csv, application/csv, '
+        'application/excel, text/comma-separated-values, text/xml, application/xml, binary/octet-stream',
+    )
+    # Block Third Party Tracking Cookies (Default in Firefox is now 5 which blocks
+    # all Cross-site cookies)
+    ffo.set_preference('network.cookie.cookieBehavior', 4)
+    # Force Firefox to open links in new tab instead of new browser window.
+    ffo.set_preference('browser.link.open_newwindow', 3)
+    if lean:
+        use_lean_firefox_options(ffo)
+    if settings.BLOCK_THIRD_PARTY:
+        block_third_party_firefox(ffo)
+    return ffo
+
+
+def make_download_dir():
+    """Create a temporary directory for a driver to download files to, removed when the
+    process exits, so that drivers don't share (or fill up) ~/Downloads.
+    """
+    directory = tempfile.mkdtemp(prefix='osf-selenium-downloads-')
+    atexit.register(shutil.rmtree, directory, True)
+    return directory
 
 
-def launch_driver(driver_name=settings.DRIVER, desired_capabilities=None):
+def launch_driver(
+    driver_name=settings.DRIVER, desired_capabilities=None, lean=settings.LEAN_BROWSER
+):
     """Create and configure a WebDriver.
     Args:
         driver_name : Name of WebDriver to use
         desired_capabilities : Desired browser specs
+        lean : Whether to launch Chrome or Firefox with a lean profile (see
+            `LEAN_CHROME_ARGUMENTS`), for tests that don't need to see the page as a
+            user would
     """
 
     try:
@@ -64,6 +290,12 @@ def launch_driver(driver_name=settings.DRIVER, desired_capabilities=None):
         chrome_options.add_argument('--headless')
         chrome_options.add_argument('--disable-gpu')
         chrome_options.add_argument('window-size=1200x600')
+        directory = make_download_dir()
+        chrome_options.add_experimental_option(
+            'prefs', {'download.default_directory': directory}
+        )
+        if lean:
+            use_lean_chrome_options(chrome_options)
         driver = driver_cls(options=chrome_options)
     elif driver_name == 'Chrome' and not settings.HEADLESS:
         from selenium.webdriver.chrome.options import Options
@@ -71,27 +303,15 @@ def launch_driver(driver_name=settings.DRIVER, desired_capabilities=None):
         chrome_options = Options()
         # disable w3c for local testing
         chrome_options.add_experimental_option('w3c', False)
-        preferences = {'download.default_directory': ''}
+        directory = make_download_dir()
+        preferences = {'download.default_directory': directory}
         chrome_options.add_experimental_option('prefs', preferences)
+        if lean:
+            use_lean_chrome_options(chrome_options)
         driver = driver_cls(options=chrome_options)
-    elif driver_name == 'Firefox' and not settings.HEADLESS:
-        from selenium.webdriver.firefox.options import Options
-
-        ffo = Options()
-        # Set the default download location [0=Desktop, 1=Downloads, 2=Specified location]
-        ffo.set_preference('browser.download.folderList', 1)
-        ffo.set_preference('browser.download.manager.showWhenStarting', False)
-        ffo.set_preference('browser.helperApps.alwaysAsk.force', False)
-        ffo.set_preference(
-            'browser.helperApps.neverAsk.saveToDisk',
-            'text/plain, application/octet-stream, application/binary, text/csv, application/csv, '
-            'application/excel, text/comma-separated-values, text/xml, application/xml, binary/octet-stream',
-        )
-        # Block Third Party Tracking Cookies (Default in Firefox is now 5 which blocks
-        # all Cross-site cookies)
-        ffo.set_preference('network.cookie.cookieBehavior', 4)
-        # Force Firefox to open links in new tab instead of new browser window.
-        ffo.set_preference('browser.link.open_newwindow', 3)
+    elif driver_name == 'Firefox':
+        directory = make_download_dir()
+        ffo = firefox_options(directory, lean)
         driver = driver_cls(options=ffo)
     elif driver_name == 'Edge' and not settings.HEADLESS:
         driver = webdriver.Edge()
@@ -99,10 +319,107 @@ def launch_driver(driver_name=settings.DRIVER, desired_capabilities=None):
     else:
         driver = driver_cls()
 
+    if lean and driver_name in ('Chrome', 'Firefox'):
+        lean_drivers.add(driver)
+    if lean and driver_name == 'Firefox':
+        firefox_heavy_resources[driver] = True
+    if driver_name == 'Firefox' and settings.BLOCK_THIRD_PARTY:
+        blocked_requests.drivers.add(driver)
+    if driver_name == 'Chrome':
+        block_urls(driver, heavy_resources=lean)
+        if settings.HEADLESS:
+            # Headless Chrome doesn't download files unless told where to
+            driver.execute_cdp_cmd(
+                'Page.setDownloadBehavior',
+                {'behavior': 'allow', 'downloadPath': directory},
+            )
+    if driver_name in ('Chrome', 'Firefox'):
+        download_dirs[driver] = directory
     driver.maximize_window()
     return driver
 
 
+def reset_driver(driver):
+    """Return a driver to the state of a freshly launched one: a single window on a
+    blank page, with no cookies and nothing in local or session storage for OSF.
+    """
+    windows = driver.window_handles
+    for window in windows[1:]:
+        driver.switch_to.window(window)
+        driver.close()
+    driver.switch_to.window(windows[0])
+
+    origins = [settings.OSF_HOME, settings.CAS_DOMAIN]
+    try:
+        # Chrome can clear every domain's cookies and storage at once
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        for origin in origins:
+            driver.execute_cdp_cmd(
+                'Storage.clearDataForOrigin',
+                {'origin': origin, 'storageTypes': 'local_storage,session_storage'},
+            )
+    except (AttributeError, WebDriverException):
+        # Elsewhere cookies and storage can only be cleared for the current page
+        for origin in origins:
+            driver.get(origin)
+            driver.delete_all_cookies()
+            driver.execute_script('localStorage.clear(); sessionStorage.clear();')
+    driver.get('about:blank')
+
+    forget_state(driver)
+    if driver in download_dirs:
+        directory = download_dirs[driver]
+        for file_name in os.listdir(directory):
+            path = os.path.join(directory, file_name)
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+
+
+class DriverPool:
+    """Keeps launched drivers warm between test sessions in the same process, such as
+    the retries of `tasks.test_selenium_with_retries`, which each call `pytest.main`.
+
+    `acquire` hands out an idle driver if there is one that still responds, launching a
+    new one otherwise, and `release` resets a driver (see `reset_driver`) and keeps it
+    for the next session. Drivers still idle when the process exits are quit then.
+    """
+
+    def __init__(self):
+        self.idle = []
+        atexit.register(self.close)
+
+    def acquire(self):
+        while self.idle:
+            driver = self.idle.pop()
+            try:
+                driver.current_url
+            except WebDriverException:
+                # The browser was closed or its session timed out
+                continue
+            return driver
+        return launch_driver()
+
+    def release(self, driver):
+        try:
+            reset_driver(driver)
+        except WebDriverException:
+            driver.quit()
+        else:
+            self.idle.append(driver)
+
+    def close(self):
+        while self.idle:
+            try:
+                self.idle.pop().quit()
+            except WebDriverException:
+                pass
+
+
+driver_pool = DriverPool()
+
+
 def find_current_browser(driver):
     current_browser = driver.desired_capabilities.get('browserName')
     return current_browser
@@ -133,16 +450,168 @@ def close_current_tab(driver, main_window):
 
 
 def find_row_by_name(files_page, file_name):
-    all_files = files_page.file_rows
-    for file_row in all_files:
-        if file_name in file_row.text:
-            return file_row
-    return
+    return files_page.file_rows.find_by_text(file_name, exact=False)
+
+
+def download_dir(driver):
+    """The directory `driver` downloads files to."""
+    return download_dirs.get(driver, os.path.expanduser('~/Downloads'))
+
+
+# Suffixes of files browsers download to before renaming them when they're finished
+PARTIAL_DOWNLOAD_SUFFIXES = ('.part', '.crdownload', '.download')
 
 
-def verify_file_download(driver, file_name):
+def download_snapshot(driver):
+    """The name and modification time (in nanoseconds) of each file in the directory
+    `driver` downloads files to, to be taken before starting a download and passed to
+    `wait_for_download` so that files already there aren't mistaken for the download.
+    """
+    directory = download_dir(driver)
+    snapshot = {}
+    try:
+        file_names = os.listdir(directory)
+    except FileNotFoundError:
+        return snapshot
+    for file_name in file_names:
+        try:
+            snapshot[file_name] = os.stat(
+                os.path.join(directory, file_name)
+            ).st_mtime_ns
+        except FileNotFoundError:
+            pass
+    return snapshot
+
+
+def finished_download(directory, name, before=None):
+    """Return the path of the finished download in `directory` whose name is `name` (or
+    for which `name(file_name)` is true, if it's callable), or None if there isn't one.
+    Files in `before` (see `download_snapshot`) that haven't been modified since don't
+    count.
+    """
+    try:
+        file_names = os.listdir(directory)
+    except FileNotFoundError:
+        return None
+    partial = [
+        file_name
+        for file_name in file_names
+        if file_name.endswith(PARTIAL_DOWNLOAD_SUFFIXES)
+    ]
+    matches = name if callable(name) else lambda file_name: file_name == name
+    for file_name in file_names:
+        # Firefox creates an empty file with the final name as soon as it starts
+        if (
+            matches(file_name)
+            and file_name not in partial
+            and not any(part.startswith(file_name) for part in partial)
+        ):
+            path = os.path.join(directory, file_name)
+            if before and file_name in before:
+                try:
+                    if os.stat(path).st_mtime_ns == before[file_name]:
+                        continue
+                except FileNotFoundError:
+                    continue
+            return path
+    return None
+
+
+class DirectoryWatcher:
+    """Wakes up when files are created, renamed into, finished or deleted in a directory,
+    with inotify where there is one (Linux) and by polling elsewhere.
+    """
+
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+
+    def __init__(self, directory, poll_interval=0.1):
+        self.poll_interval = poll_interval
+        self.fd = None
+        libc_name = ctypes.util.find_library('c')
+        libc = ctypes.CDLL(libc_name, use_errno=True) if libc_name else None
+        if libc is not None and hasattr(libc, 'inotify_init1'):
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            mask = (
+                self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE
+            )
+            if fd >= 0 and libc.inotify_add_watch(fd, directory.encode(), mask) >= 0:
+                self.fd = fd
+            elif fd >= 0:
+                os.close(fd)
+
+    def wait(self, timeout):
+        """Wait up to `timeout` seconds for something to change."""
+        if self.fd is None:
+            time.sleep(min(timeout, self.poll_interval))
+            return
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if ready:
+            # Only whether something changed matters, not what
+            try:
+                while os.read(self.fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def file_checksum(path, algorithm='sha256'):
+    """Return the hex digest of the file at `path`, read a chunk at a time."""
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb') as downloaded_file:
+        for chunk in iter(lambda: downloaded_file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def wait_for_download(
+    driver, name, timeout=settings.TIMEOUT, checksum=None, before=None
+):
+    """Wait for the browser to finish downloading a file, returning the moment it's
+    renamed from its partial download name to its final one.
+
+    Args:
+        name : The file's name, or a function that takes a file name and returns True
+            for the file waited for
+        timeout : How many seconds to wait
+        checksum : The name of a hashlib algorithm to also return the file's digest with
+        before : A `download_snapshot` taken before the download was started, so that a
+            file of the same name left by an earlier download isn't returned
+    Returns the path of the file (with its hex digest if `checksum` is given), or None if
+    it didn't finish downloading within `timeout` seconds.
+    """
+    directory = download_dir(driver)
+    end_time = time.monotonic() + timeout
+    with DirectoryWatcher(directory) as watcher:
+        while True:
+            path = finished_download(directory, name, before)
+            if path is not None:
+                break
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                return None
+            watcher.wait(remaining)
+    if checksum:
+        return path, file_checksum(path, checksum)
+    return path
+
+
+def verify_file_download(driver, file_name, before=None):
     """Helper function to verify the file download functionality on the Project Files
-    page.
+    page. `before` is a `download_snapshot` taken before the download was started.
     """
 
     current_date = datetime.datetime.now()
@@ -160,19 +629,21 @@ def verify_file_download(driver, file_name):
         file_create_date = datetime.datetime.fromtimestamp(file_props['created_time'])
         assert file_create_date.date() == current_date.date()
     else:
-        # First verify the downloaded file exists
-        file_path = os.path.expanduser('~/Downloads/' + file_name)
-        assert os.path.exists(file_path)
+        # First verify the file finishes downloading
+        file_path = wait_for_download(driver, file_name, before=before)
+        assert file_path is not None
         # Next verify the file was downloaded today
         file_mtime = os.path.getmtime(file_path)
         file_mod_date = datetime.datetime.fromtimestamp(file_mtime)
         assert file_mod_date.date() == current_date.date()
 
 
-def latest_download_file():
-    path = os.path.expanduser('~/Downloads/')
-    os.chdir(path)
-    files = sorted(os.listdir(os.getcwd()), key=os.path.getmtime)
+def latest_download_file(driver):
+    directory = download_dir(driver)
+    files = sorted(
+        os.listdir(directory),
+        key=lambda file_name: os.path.getmtime(os.path.join(directory, file_name)),
+    )
     newest = files[-1]
     return newest
 
@@ -183,23 +654,42 @@ def get_guid_from_url(url, itemno):
     return guid
 
 
+def read_table(driver, table_path, selector=By.XPATH, match=None, columns=None):
+    """Read a whole table (a `<table>` or an ARIA grid) with a single script call.
+
+    Args:
+        table_path : Path of the table element, dependant on selector
+        selector : An instance of selenium By
+        match : If given, stop reading after the first row with a cell containing this text
+        columns : None to return each row as a list of cell text, True to return each row
+            as a dictionary keyed by the table's column headers, or a list of names to key
+            the cells by (in order)
+    Returns the list of rows.
+    """
+    table = driver.execute_script(scripts.READ_TABLE, selector, table_path, match)
+    if table is None:
+        raise NoSuchElementException('No table found at {}'.format(table_path))
+    rows = table['rows']
+    if columns is True:
+        columns = table['headers']
+    if columns:
+        rows = [dict(zip(columns, row)) for row in rows]
+    return rows
+
+
 def read_data_from_table(driver, table_path, check_match, item_match=None):
-    datalist = []
-    table_data = driver.find_element_by_xpath(table_path)
-    path1 = table_path + '/tbody/tr'
-    rows = table_data.find_elements_by_xpath(path1)
-    rlen = len(rows)
-
-    for i in range(1, rlen + 1):
-        path2 = path1 + '[' + str(i) + ']/td'
-        items = driver.find_elements_by_xpath(path2)
-        clen = len(items)
-        for j in range(1, clen + 1):
-            path3 = path2 + '[' + str(j) + ']'
-            cell_data = driver.find_element_by_xpath(path3).text
-            datalist.append(cell_data)
-            if check_match:
-                if item_match in cell_data:
-                    return i, datalist
-
-    return rlen, datalist
+    """Return the text of the cells in a table (given by its xpath) as one flat list.
+
+    If check_match is True, stop at the first cell containing item_match and return the
+    (1-based) number of its row along with the cells read so far. Otherwise return the
+    number of rows along with every cell.
+    """
+    rows = read_table(driver, table_path, match=item_match if check_match else None)
+    datalist = [cell for row in rows for cell in row]
+    if check_match and rows:
+        last_row = rows[-1]
+        for j, cell_data in enumerate(last_row):
+            if item_match in cell_data:
+                del datalist[len(datalist) - len(last_row) + j + 1 :]
+                break
+    return len(rows), datalist